@@ -1,3 +1,16 @@
 from .network import Network
 from .organization import Organization
-from .device import Device
\ No newline at end of file
+from .device import Device
+from .clientTable import ClientTable
+from .sensorReadings import SensorReadings
+from .fanOut import fanOut, FanOutResult
+from .rateBudget import RateBudget, getRateBudget, useRateBudget
+from .portStatusPoller import PortChange
+from .fleet import Fleet
+from .retry import RetryPolicy, RetryBudget, setRetryPolicy, useRetryBudget
+from .exporter import Exporter
+from .portTable import PortTable
+from .organizationDirectory import configureOrganizationDirectory
+from .transport import Transport, RequestsTransport, HttpxTransport, Http2Transport, InMemoryTransport, RecordingTransport, ReplayTransport, setTransport, useTransport
+from .codec import DecodeStats, decodeStats, useDecodeStats
+from .refresh import RefreshResult
\ No newline at end of file
@@ -0,0 +1,72 @@
+from time import monotonic, sleep
+from .merakiObject import _MerakiObject
+from .fanOut import fanOut, FanOutResult
+
+class _ActionBatches(_MerakiObject):
+    def __init__(self, apiKey: str, organizationId: str) -> None:
+        """ init action batches object, runs many api actions as a few organization action batches
+
+        Args:
+            apiKey (str): api key of user
+            organizationId (str): organization id the actions belong to
+        """
+        super().__init__(apiKey)
+        self.organizationId = organizationId
+
+    def __repr__(self) -> str:
+        return "Action Batches org: %s" % self.organizationId
+
+    def __waitFor(self, batch: dict, pollInterval: float, timeout: float) -> dict:
+        endpoint = 'organizations/%s/actionBatches/%s' % (self.organizationId, batch['id'])
+        deadline = monotonic() + timeout
+
+        while not batch['status']['completed'] and not batch['status']['failed']:
+            if monotonic() > deadline:
+                raise TimeoutError('action batch %s did not finish in %s seconds' % (batch['id'], timeout))
+            sleep(pollInterval)
+
+            statusCode, response = self.apiCall(endpoint)
+            if statusCode == 200: batch = response
+        return batch
+
+    def runChunk(self, actions: list[dict], pollInterval: float = 1, timeout: float = 300) -> dict:
+        """ runs a single action batch and waits until it is finished
+
+        Args:
+            actions (list[dict]): actions of the batch (100 max)
+            pollInterval (float, optional): seconds between status checks. Defaults to 1.
+            timeout (float, optional): seconds to wait for the batch. Defaults to 300.
+
+        Returns:
+            dict: finished action batch, see status['failed'] and status['errors']
+        """
+        endpoint = 'organizations/%s/actionBatches' % self.organizationId
+        payload = {
+            "confirmed": True,
+            "synchronous": False,
+            "actions": actions
+        }
+
+        statusCode, response = self.apiCall(endpoint, payload, 'POST')
+        if statusCode != 201:
+            raise RuntimeError('action batch not created; error: %s %s' % (statusCode, response))
+
+        return self.__waitFor(response, pollInterval, timeout)
+
+    def run(self, actions: list[dict], chunkSize: int = 100, maxConcurrent: int = 5,
+            pollInterval: float = 1, timeout: float = 300) -> FanOutResult:
+        """ splits the actions into chunks and runs the chunks as action batches at the same time
+
+        Args:
+            actions (list[dict]): actions to run ex: {"resource": "/devices/XXXX", "operation": "update", "body": {...}}
+            chunkSize (int, optional): actions per batch (100 max). Defaults to 100.
+            maxConcurrent (int, optional): batches running at once (meraki allows 5 per organization). Defaults to 5.
+            pollInterval (float, optional): seconds between status checks. Defaults to 1.
+            timeout (float, optional): seconds to wait for each batch. Defaults to 300.
+
+        Returns:
+            FanOutResult: finished batch by chunk start index, or the error of the chunk
+        """
+        chunks = [(start, actions[start:start + chunkSize]) for start in range(0, len(actions), chunkSize)]
+        return fanOut(chunks, lambda chunk: self.runChunk(chunk[1], pollInterval, timeout),
+                      key=lambda chunk: chunk[0], maxWorkers=maxConcurrent)
@@ -0,0 +1,132 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from threading import Event, Lock, Thread
+from time import monotonic
+from typing import Callable
+from .merakiObject import _MerakiObject
+from .rateBudget import currentRateBudget
+
+class _BackgroundRefresher(_MerakiObject):
+    def __init__(self, apiKey: str, onAccess: bool = False, reserve: float = 0.5, maxWorkers: int = 2) -> None:
+        """ init background refresher, serves the cached resources right away and loads them again in the background
+        (stale while revalidate), the new data is swapped in once it is loaded
+
+        Args:
+            apiKey (str): api key of user
+            onAccess (bool, optional): refresh a resource only when it is read with get and older than its interval,
+                instead of every interval once started. Defaults to False.
+            reserve (float, optional): part of the rate budget burst left to foreground calls, a refresh waits
+                while fewer calls are available. Defaults to 0.5.
+            maxWorkers (int, optional): resources refreshed at once. Defaults to 2.
+        """
+        super().__init__(apiKey)
+        self.onAccess = onAccess
+        self.reserve = reserve
+        self.resources = {} # name to {'refresh', 'get', 'interval'}
+        self.refreshed = {} # name to monotonic time of the last refresh
+        self.errors = {} # name to exception of the last refresh that failed
+        self.__running = set()
+        self.__lock = Lock()
+        self.__pool = ThreadPoolExecutor(max_workers=maxWorkers)
+        self.__stop = Event()
+        self.__thread = None
+
+    def __repr__(self) -> str:
+        return "Background Refresher: %s" % ', '.join('%s every %ss' % (name, r['interval']) for name, r in self.resources.items())
+
+    def register(self, name: str, refresh: Callable, get: Callable = None, interval: float = 300) -> None:
+        """ adds a resource to keep fresh
+
+        Args:
+            name (str): name of resource ex: 'vlans'
+            refresh (Callable): loads the resource again and swaps it in, keeping the current data if loading fails
+            get (Callable, optional): returns the cached resource, for get. Defaults to None.
+            interval (float, optional): seconds the resource stays fresh. Defaults to 300.
+        """
+        with self.__lock:
+            self.resources[name] = {'refresh': refresh, 'get': get, 'interval': interval}
+            self.refreshed[name] = monotonic()
+
+    def setInterval(self, name: str, interval: float) -> None:
+        self.resources[name]['interval'] = interval
+
+    def age(self, name: str) -> float:
+        """ seconds since the resource was last refreshed
+        """
+        return monotonic() - self.refreshed[name]
+
+    def isStale(self, name: str) -> bool:
+        return self.age(name) > self.resources[name]['interval']
+
+    def __canSpend(self) -> bool:
+        budget = currentRateBudget(self._apiKey)
+        return budget.available() >= max(1, budget.burst * self.reserve)
+
+    def __refresh(self, name: str) -> None:
+        try:
+            self.resources[name]['refresh']()
+            self.errors.pop(name, None)
+        except Exception as err:
+            self.errors[name] = err
+            print('Refresh of %s failed:' % name, err)
+        finally:
+            with self.__lock:
+                self.refreshed[name] = monotonic()
+                self.__running.discard(name)
+
+    def revalidate(self, name: str, force: bool = False) -> bool:
+        """ starts a background refresh of the resource if it is stale (and not already refreshing)
+
+        Args:
+            name (str): name of resource
+            force (bool, optional): refresh even if fresh or the rate budget is low. Defaults to False.
+
+        Returns:
+            bool: if a refresh was started
+        """
+        with self.__lock:
+            if name in self.__running: return False
+            if not force and (not self.isStale(name) or not self.__canSpend()): return False
+            self.__running.add(name)
+        self.__pool.submit(copy_context().run, self.__refresh, name)
+        return True
+
+    def get(self, name: str):
+        """ the cached resource right away, starting a background refresh if it is stale
+
+        Args:
+            name (str): name of resource
+
+        Returns:
+            cached resource
+        """
+        self.revalidate(name)
+        return self.resources[name]['get']()
+
+    def refreshNow(self, name: str) -> None:
+        """ refreshes the resource and waits for it
+        """
+        with self.__lock:
+            self.__running.add(name)
+        self.__refresh(name)
+
+    def __run(self) -> None:
+        while not self.__stop.is_set():
+            if not self.onAccess:
+                for name in list(self.resources):
+                    self.revalidate(name)
+            self.__stop.wait(1)
+
+    def start(self) -> None:
+        """ starts refreshing the stale resources in a background thread (only on get with onAccess)
+        """
+        if self.__thread != None and self.__thread.is_alive(): return
+        self.__stop.clear()
+        self.__thread = Thread(target=copy_context().run, args=(self.__run,), daemon=True)
+        self.__thread.start()
+
+    def stop(self) -> None:
+        """ stops the background thread, refreshes already started still finish
+        """
+        self.__stop.set()
+        if self.__thread != None: self.__thread.join()
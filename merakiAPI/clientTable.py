@@ -0,0 +1,157 @@
+from array import array
+from itertools import compress
+
+class ClientTable():
+    """ columnar table of clients, every field is stored as its own array so filters only walk the columns they need """
+    textFields = ['id', 'mac', 'ip', 'description', 'user', 'manufacturer', 'os',
+                  'recentDeviceSerial', 'recentDeviceName', 'recentDeviceConnection',
+                  'ssid', 'switchport', 'status', 'firstSeen', 'lastSeen', 'networkId']
+    numberFields = {'vlan': 'l', 'usageSent': 'd', 'usageRecv': 'd'}
+
+    def __init__(self, columns: dict = None) -> None:
+        """ init client table
+
+        Args:
+            columns (dict, optional): already built columns, field name to array. Defaults to None.
+        """
+        self.columns = {field: [] for field in self.textFields}
+        self.columns |= {field: array(code) for field, code in self.numberFields.items()}
+
+        if columns != None:
+            for field, column in columns.items():
+                self.columns[field] = column
+
+    def __repr__(self) -> str:
+        return "Client Table: %i clients" % len(self)
+
+    def __len__(self) -> int:
+        return len(self.columns['id'])
+
+    def __getitem__(self, field: str):
+        return self.columns[field]
+
+    def extend(self, clients: list[dict], networkId: str = None) -> None:
+        """ add clients from a page of the clients endpoint
+
+        Args:
+            clients (list[dict]): clients as returned by the api
+            networkId (str, optional): network id the clients were pulled from. Defaults to None.
+        """
+        for field in self.textFields:
+            if field == 'networkId': continue
+            self.columns[field].extend(None if client.get(field) == None else str(client.get(field)) for client in clients)
+        self.columns['networkId'].extend(networkId for _ in clients)
+
+        # vlan is -1 when the client has none
+        self.columns['vlan'].extend(int(client['vlan']) if client.get('vlan') not in [None, ''] else -1 for client in clients)
+        self.columns['usageSent'].extend(float((client.get('usage') or {}).get('sent') or 0) for client in clients)
+        self.columns['usageRecv'].extend(float((client.get('usage') or {}).get('recv') or 0) for client in clients)
+
+    @classmethod
+    def concat(cls, tables: list):
+        """ join several client tables into one
+
+        Args:
+            tables (list[ClientTable]): tables to join
+
+        Returns:
+            ClientTable: joined table
+        """
+        joined = cls()
+        for table in tables:
+            for field, column in table.columns.items():
+                joined.columns[field].extend(column)
+        return joined
+
+    def rows(self) -> list[dict]:
+        """ turns the table back into a list of client dicts
+
+        Returns:
+            list[dict]: one dict per client
+        """
+        fields = list(self.columns.keys())
+        return [dict(zip(fields, row)) for row in zip(*self.columns.values())]
+
+    # ------------- Masks ------------- #
+    def trunkMask(self, trunkPorts: dict) -> list[bool]:
+        """ mask of clients seen on a trunk port
+
+        Args:
+            trunkPorts (dict): switch serial to list of trunk port ids
+
+        Returns:
+            list[bool]: True where the client is on a trunk port
+        """
+        trunks = {(serial, str(port)) for serial, ports in trunkPorts.items() for port in ports}
+        return [(serial, port) in trunks for serial, port in zip(self.columns['recentDeviceSerial'], self.columns['switchport'])]
+
+    def vlanMask(self, *vlans: int) -> list[bool]:
+        """ mask of clients on any of the vlans
+
+        Returns:
+            list[bool]: True where the client is on one of the vlans
+        """
+        vlans = {int(vlan) for vlan in vlans}
+        return [vlan in vlans for vlan in self.columns['vlan']]
+
+    def switchportMask(self, ports: list[str], serial: str = None) -> list[bool]:
+        """ mask of clients on any of the switch ports
+
+        Args:
+            ports (list[str]): port ids
+            serial (str, optional): only match ports of this switch. Defaults to None.
+
+        Returns:
+            list[bool]: True where the client is on one of the ports
+        """
+        ports = {str(port) for port in ports}
+        if serial == None:
+            return [port in ports for port in self.columns['switchport']]
+        return [port in ports and s == serial for s, port in zip(self.columns['recentDeviceSerial'], self.columns['switchport'])]
+
+    # ------------- Filters ------------- #
+    def filter(self, *masks: list[bool]):
+        """ keeps the clients where every mask is True, every client if there is no mask
+
+        Returns:
+            ClientTable: filtered table
+        """
+        if len(masks) == 0: mask = [True] * len(self)
+        else: mask = [all(values) for values in zip(*masks)] if len(masks) > 1 else masks[0]
+
+        columns = {}
+        for field, column in self.columns.items():
+            kept = compress(column, mask)
+            columns[field] = array(column.typecode, kept) if isinstance(column, array) else list(kept)
+        return ClientTable(columns)
+
+    def withoutTrunkPorts(self, trunkPorts: dict):
+        """ drops clients seen on trunk ports
+
+        Args:
+            trunkPorts (dict): switch serial to list of trunk port ids
+
+        Returns:
+            ClientTable: filtered table
+        """
+        return self.filter([not trunk for trunk in self.trunkMask(trunkPorts)])
+
+    def onVlan(self, *vlans: int):
+        """ keeps clients on any of the vlans
+
+        Returns:
+            ClientTable: filtered table
+        """
+        return self.filter(self.vlanMask(*vlans))
+
+    def onSwitchport(self, ports: list[str], serial: str = None):
+        """ keeps clients on any of the switch ports
+
+        Args:
+            ports (list[str]): port ids
+            serial (str, optional): only match ports of this switch. Defaults to None.
+
+        Returns:
+            ClientTable: filtered table
+        """
+        return self.filter(self.switchportMask(ports, serial))
@@ -0,0 +1,109 @@
+import json
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from time import perf_counter
+
+# fastest json library installed
+try:
+    import orjson
+    codecName = 'orjson'
+except ImportError:
+    orjson = None
+    try:
+        import ujson
+        codecName = 'ujson'
+    except ImportError:
+        ujson = None
+        codecName = 'json'
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+# compressions asked of meraki, br only when requests/httpx can decode it
+acceptEncoding = 'gzip, deflate, br' if brotli != None else 'gzip, deflate'
+
+def encode(body) -> bytes:
+    """ json body as bytes with the fastest codec installed
+    """
+    if codecName == 'orjson': return orjson.dumps(body)
+    if codecName == 'ujson': return ujson.dumps(body, ensure_ascii=False).encode()
+    return json.dumps(body).encode()
+
+def _loads(content: bytes):
+    if codecName == 'orjson': return orjson.loads(content)
+    if codecName == 'ujson': return ujson.loads(content)
+    return json.loads(content)
+
+
+class DecodeStats():
+    def __init__(self) -> None:
+        """ init decode stats, time spent parsing response bodies, compare with the time of the whole job to see
+        what parsing costs against building the objects
+        """
+        self.calls = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.encodings = {} # content encoding of responses to count ex: {'gzip': 10}
+        self.__lock = Lock()
+
+    def __repr__(self) -> str:
+        rate = self.bytes / self.seconds / 1e6 if self.seconds > 0 else 0
+        return "Decode Stats %s: %i bodies, %.1f MB in %.3fs (%.1f MB/s)" % (codecName, self.calls, self.bytes / 1e6, self.seconds, rate)
+
+    def add(self, size: int, seconds: float, encoding: str = None) -> None:
+        with self.__lock:
+            self.calls += 1
+            self.bytes += size
+            self.seconds += seconds
+            encoding = encoding or 'identity'
+            self.encodings[encoding] = self.encodings.get(encoding, 0) + 1
+
+    def reset(self) -> None:
+        with self.__lock:
+            self.calls, self.bytes, self.seconds, self.encodings = 0, 0, 0.0, {}
+
+
+# every decode of the process, and the stats of the job in use
+decodeStats = DecodeStats()
+_decodeStats = ContextVar('decodeStats', default=None)
+
+@contextmanager
+def useDecodeStats(stats: DecodeStats):
+    """ every body decoded inside the with block (and fan outs started from it) is also counted in stats
+
+    Args:
+        stats (DecodeStats): stats of the job
+    """
+    token = _decodeStats.set(stats)
+    try:
+        yield stats
+    finally:
+        _decodeStats.reset(token)
+
+def decode(content: bytes, encoding: str = None):
+    """ parses a json body with the fastest codec installed, timing it
+
+    Args:
+        content (bytes): body, already decompressed
+        encoding (str, optional): content encoding it was sent with, for the stats. Defaults to None.
+
+    Raises:
+        ValueError: body is not json
+
+    Returns:
+        parsed body
+    """
+    start = perf_counter()
+    try:
+        return _loads(content)
+    finally:
+        seconds = perf_counter() - start
+        decodeStats.add(len(content), seconds, encoding)
+        stats = _decodeStats.get()
+        if stats != None: stats.add(len(content), seconds, encoding)
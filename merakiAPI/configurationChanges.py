@@ -0,0 +1,196 @@
+import re
+from threading import Event, Thread
+from time import time
+from typing import Callable
+from .merakiObject import _MerakiObject
+from .sensorReadings import _toTimestamp, _toIso
+from .organizationObjects import _TemplateCatalog
+
+_serialPattern = re.compile(r'\b[A-Z0-9]{4}-[A-Z0-9]{4}-[A-Z0-9]{4}\b')
+
+def affectedBy(change: dict) -> set:
+    """ objects a configuration change touches, as keys like ('ssid', networkId, number)
+
+    Args:
+        change (dict): change from the configuration changes endpoint
+
+    Returns:
+        set: affected keys, ('network', networkId) when the change could not be narrowed down
+    """
+    networkId = change.get('networkId')
+    page = (change.get('page') or '').lower()
+    label = (change.get('label') or '').lower()
+    affected = set()
+
+    if change.get('ssidNumber') != None:
+        affected.add(('ssid', networkId, int(change['ssidNumber'])))
+    if 'vlan' in page or 'addressing' in page or 'dhcp' in page:
+        affected.add(('vlans', networkId))
+    if 'firewall' in page:
+        affected.add(('firewall', networkId))
+    if 'switch port' in page or 'switchport' in label:
+        affected.add(('switchPorts', networkId))
+    if 'policy object' in page or 'policy object' in label:
+        affected.add(('policyObjects', None))
+        affected.add(('policyObjectGroups', None))
+    if 'template' in page:
+        affected.add(('templates', None))
+
+    text = ' '.join(str(change.get(key) or '') for key in ['label', 'oldValue', 'newValue'])
+    for serial in _serialPattern.findall(text):
+        affected.add(('device', serial))
+
+    if len(affected) == 0 and networkId != None:
+        affected.add(('network', networkId))
+    return affected
+
+
+class _ConfigurationChangeWatcher(_MerakiObject):
+    def __init__(self, apiKey: str, organizationId: str, since: float = None, interval: float = 300) -> None:
+        """ init configuration change watcher, each poll reads the changes since the last poll
+        and refreshes only the watched objects they touch
+
+        Args:
+            apiKey (str): api key of user
+            organizationId (str): organization id to watch
+            since (float, optional): epoch seconds to read changes from, if None from now. Defaults to None.
+            interval (float, optional): seconds between polls when started. Defaults to 300.
+        """
+        super().__init__(apiKey)
+        self.organizationId = organizationId
+        self.since = since if since != None else time()
+        self.interval = interval
+        self.organization = None
+        self.networks = {}
+        self.stale = set() # network ids changed in a way that could not be narrowed down
+        self.__callbacks = []
+        self.__seen = set()
+        self.__stop = Event()
+        self.__thread = None
+
+    def __repr__(self) -> str:
+        return "Configuration Change Watcher org: %s, %i networks" % (self.organizationId, len(self.networks))
+
+    def watch(self, obj) -> None:
+        """ keeps an organization or network object up to date
+
+        Args:
+            obj (Organization or Network): object to keep up to date
+        """
+        if hasattr(obj, 'invalidate'):
+            self.organization = obj
+        else:
+            self.networks[obj.id] = obj
+
+    def onChange(self, callback: Callable) -> None:
+        """ adds a callback called with each change and its affected keys
+
+        Args:
+            callback (Callable): function taking the change dict and the set of affected keys
+        """
+        self.__callbacks.append(callback)
+
+    def getChanges(self, perPage: int = 5000) -> list[dict]:
+        """ reads the changes since the last poll and moves the cursor, nothing if a page could not be read
+
+        Args:
+            perPage (int, optional): changes per page (3 - 5000). Defaults to 5000.
+
+        Returns:
+            list[dict]: new changes
+        """
+        endpoint = 'organizations/%s/configurationChanges' % self.organizationId
+        # changes come newest first, the cursor only moves once every page was read
+        # so a failed page is asked for again on the next poll
+        changes = []
+        since, seen, polled = self.since, set(self.__seen), set()
+        for statusCode, page in self._iterPages(endpoint, {'t0': _toIso(self.since), 'perPage': perPage}):
+            if statusCode != 200: return []
+            for change in page:
+                ts = _toTimestamp(change['ts'])
+                key = (ts, change.get('networkId'), change.get('label'), str(change.get('newValue')))
+                if key in polled or key in self.__seen: continue # read earlier in this poll, or the last one at the cursor
+                polled.add(key)
+
+                if ts > since:
+                    since = ts
+                    seen = set()
+                if ts == since: seen.add(key)
+                changes.append(change)
+        self.since, self.__seen = since, seen
+        return changes
+
+    def __devices(self, network) -> list:
+        return getattr(network, 'cameras', []) + getattr(network, 'sensors', []) + getattr(network, 'wireless', []) + getattr(network, 'switches', [])
+
+    def refresh(self, key: tuple) -> None:
+        """ refreshes the watched objects of one affected key
+
+        Args:
+            key (tuple): affected key from affectedBy
+        """
+        kind = key[0]
+        network = self.networks.get(key[1]) if kind in ['ssid', 'vlans', 'firewall', 'switchPorts', 'network'] else None
+
+        if kind == 'ssid' and network != None:
+            for wireless in getattr(network, 'wireless', []):
+                for ssid in wireless.ssids or []:
+                    if ssid.number == key[2]: ssid.getSSID()
+        elif kind == 'vlans' and hasattr(network, 'appliance'):
+            network.appliance.refreshVLANs()
+        elif kind == 'firewall' and hasattr(network, 'appliance'):
+            network.appliance.firewall.refresh()
+        elif kind == 'switchPorts' and network != None:
+            for switch in getattr(network, 'switches', []):
+                switch.refreshPorts()
+        elif kind == 'device':
+            for watched in self.networks.values():
+                for device in self.__devices(watched):
+                    if device.serial == key[1]: device.get()
+        elif kind == 'templates':
+            _TemplateCatalog.forOrganization(self._apiKey, self.organizationId).invalidate()
+        elif kind in ['policyObjects', 'policyObjectGroups'] and self.organization != None:
+            self.organization.invalidate(kind)
+        elif kind == 'network' and network != None:
+            self.stale.add(key[1])
+
+    def poll(self) -> list[dict]:
+        """ reads the new changes, refreshes each affected object once and calls the callbacks
+
+        Returns:
+            list[dict]: new changes
+        """
+        changes = self.getChanges()
+
+        affected = set()
+        for change in changes:
+            keys = affectedBy(change)
+            affected |= keys
+            for callback in self.__callbacks:
+                callback(change, keys)
+
+        for key in affected:
+            self.refresh(key)
+        return changes
+
+    def __run(self) -> None:
+        while not self.__stop.is_set():
+            try:
+                self.poll()
+            except Exception as err:
+                print('Configuration change poll failed:', err)
+            self.__stop.wait(self.interval)
+
+    def start(self) -> None:
+        """ starts polling every interval in a background thread
+        """
+        if self.__thread != None and self.__thread.is_alive(): return
+        self.__stop.clear()
+        self.__thread = Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+    def stop(self) -> None:
+        """ stops the background polling
+        """
+        self.__stop.set()
+        if self.__thread != None: self.__thread.join()
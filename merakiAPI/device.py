@@ -1,7 +1,15 @@
 from .merakiObject import _MerakiObject
+from .refresh import contentHash
 
 ############### Finished?? ###############
 
+_fields = ['name', 'model', 'url', 'networkId'] # settings kept as attributes, the others are in additionalOptions
+
+def _settingsHash(payload: dict) -> str:
+    """ content hash of a device payload, the same as contentHash of a device holding exactly its settings
+    """
+    return contentHash({key: payload.get(key) for key in _fields} | {k: v for k, v in payload.items() if k not in _fields + ['serial']})
+
 class Device(_MerakiObject):
     def __init__(self, apiKey: str, serial: str, claimed: bool = True, payload: dict = None) -> None:
         """ init device object
@@ -62,4 +70,28 @@ class Device(_MerakiObject):
         if statusCode != 200:
             print('Update Failed')
             
-        self.get()
\ No newline at end of file
+        self.get()
+        
+    def contentHash(self) -> str:
+        """ hash of the settings of the device, compare with contentHash of a payload without the serial to tell if it changed
+        """
+        return _settingsHash({key: getattr(self, key, None) for key in _fields} | getattr(self, 'additionalOptions', {}))
+    
+    def _applyUpdate(self, payload: dict, replace: bool = False) -> None:
+        """ applies an update the api already accepted, without getting the device again
+
+        Args:
+            payload (dict): accepted update
+            replace (bool, optional): payload holds every setting (ex: from a listing), settings missing from it are dropped. Defaults to False.
+        """
+        if replace:
+            for key in _fields: setattr(self, key, payload.get(key))
+            self.additionalOptions = {k: v for k, v in payload.items() if k not in _fields + ['serial']}
+            return
+        
+        if not hasattr(self, 'additionalOptions'): self.additionalOptions = {}
+        for key, value in payload.items():
+            if key in _fields:
+                setattr(self, key, value)
+            elif key != 'serial':
+                self.additionalOptions[key] = value
\ No newline at end of file
@@ -0,0 +1,254 @@
+import csv
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextvars import copy_context
+from .merakiObject import _MerakiObject
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+    import pyarrow.ipc
+except ImportError:
+    pyarrow = None
+
+# fixed schema of every resource, column name and type ('json' columns hold lists/dicts as json text)
+schemas = {
+    'devices': [('serial', 'str'), ('name', 'str'), ('model', 'str'), ('networkId', 'str'), ('mac', 'str'),
+                ('lanIp', 'str'), ('firmware', 'str'), ('productType', 'str'), ('address', 'str'),
+                ('lat', 'float'), ('lng', 'float'), ('tags', 'json'), ('notes', 'str')],
+    'switchPorts': [('serial', 'str'), ('networkId', 'str'), ('portId', 'str'), ('name', 'str'), ('enabled', 'bool'),
+                    ('type', 'str'), ('vlan', 'int'), ('voiceVlan', 'int'), ('allowedVlans', 'str'),
+                    ('poeEnabled', 'bool'), ('isolationEnabled', 'bool'), ('stpGuard', 'str'),
+                    ('accessPolicyType', 'str'), ('tags', 'json')],
+    'ssids': [('networkId', 'str'), ('number', 'int'), ('name', 'str'), ('enabled', 'bool'), ('authMode', 'str'),
+              ('encryptionMode', 'str'), ('ipAssignmentMode', 'str'), ('defaultVlanId', 'int'),
+              ('visible', 'bool'), ('bandSelection', 'str')],
+    'vlans': [('networkId', 'str'), ('id', 'int'), ('name', 'str'), ('subnet', 'str'), ('applianceIp', 'str'),
+              ('groupPolicyId', 'str'), ('dhcpHandling', 'str'), ('reservedIpRanges', 'json'),
+              ('fixedIpAssignments', 'json'), ('dnsNameservers', 'str')],
+    'policyObjects': [('id', 'str'), ('name', 'str'), ('category', 'str'), ('type', 'str'), ('cidr', 'str'),
+                      ('fqdn', 'str'), ('groupIds', 'json'), ('createdAt', 'str'), ('updatedAt', 'str')],
+    'policyObjectGroups': [('id', 'str'), ('name', 'str'), ('category', 'str'), ('objectIds', 'json'),
+                           ('networkIds', 'json'), ('createdAt', 'str'), ('updatedAt', 'str')],
+}
+
+# resources read per network and the product type a network needs to have them
+networkResources = {'ssids': 'wireless', 'vlans': 'appliance'}
+
+def _coerce(value, type: str):
+    if value == None or value == '': return None
+    if type == 'json': return json.dumps(value)
+    if type == 'int':
+        try: return int(value)
+        except (TypeError, ValueError): return None
+    if type == 'float': return float(value)
+    if type == 'bool': return bool(value)
+    return str(value)
+
+def toRow(resource: str, item: dict) -> list:
+    """ turns an api item into a row of the resource schema
+
+    Args:
+        resource (str): resource name, key of schemas
+        item (dict): item from the api
+
+    Returns:
+        list: values in schema order
+    """
+    return [_coerce(item.get(column), type) for column, type in schemas[resource]]
+
+
+class _CsvWriter():
+    def __init__(self, path: str, schema: list) -> None:
+        self.file = open(path, 'w', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow([column for column, _ in schema])
+
+    def write(self, rows: list[list]) -> None:
+        self.writer.writerows(rows)
+
+    def close(self) -> None:
+        self.file.close()
+
+class _JsonlWriter():
+    def __init__(self, path: str, schema: list) -> None:
+        self.file = open(path, 'w')
+        self.columns = [column for column, _ in schema]
+
+    def write(self, rows: list[list]) -> None:
+        self.file.writelines(json.dumps(dict(zip(self.columns, row))) + '\n' for row in rows)
+
+    def close(self) -> None:
+        self.file.close()
+
+class _ArrowWriter():
+    types = {'str': 'string', 'json': 'string', 'int': 'int64', 'float': 'float64', 'bool': 'bool_'}
+
+    def __init__(self, path: str, schema: list, parquet: bool = True) -> None:
+        self.schema = pyarrow.schema([(column, getattr(pyarrow, self.types[type])()) for column, type in schema])
+        if parquet:
+            self.writer = pyarrow.parquet.ParquetWriter(path, self.schema)
+        else:
+            self.sink = pyarrow.OSFile(path, 'wb')
+            self.writer = pyarrow.ipc.new_file(self.sink, self.schema)
+
+    def write(self, rows: list[list]) -> None:
+        columns = [list(column) for column in zip(*rows)] if len(rows) > 0 else [[] for _ in self.schema]
+        self.writer.write_table(pyarrow.Table.from_arrays([pyarrow.array(column, field.type) for column, field in zip(columns, self.schema)], schema=self.schema))
+
+    def close(self) -> None:
+        self.writer.close()
+        if hasattr(self, 'sink'): self.sink.close()
+
+
+class Exporter(_MerakiObject):
+    def __init__(self, apiKey: str, organizationId: str) -> None:
+        """ init exporter, streams organization inventory into parquet, arrow, csv or jsonl files
+
+        Args:
+            apiKey (str): api key of user
+            organizationId (str): organization id to export
+        """
+        super().__init__(apiKey)
+        self.organizationId = organizationId
+
+    def __repr__(self) -> str:
+        return "Exporter org: %s" % self.organizationId
+
+    def __openWriter(self, path: str, schema: list, format: str):
+        if format in ['parquet', 'arrow'] and pyarrow == None:
+            print('pyarrow is not installed, writing csv instead')
+            format, path = 'csv', os.path.splitext(path)[0] + '.csv'
+
+        if format == 'parquet': return _ArrowWriter(path, schema, True), path
+        if format == 'arrow': return _ArrowWriter(path, schema, False), path
+        if format == 'jsonl': return _JsonlWriter(path, schema), path
+        return _CsvWriter(path, schema), path
+
+    def __pages(self, endpoint: str, perPage: int):
+        """ pages of endpoint, raises instead of ending early so an export is never silently missing rows
+        """
+        for statusCode, page in self._iterPages(endpoint, {'perPage': perPage}):
+            if statusCode != 200: raise LookupError('unable to get a page of %s; error: %s' % (endpoint, statusCode))
+            yield page
+
+    def __networkIds(self, productType: str) -> list[str]:
+        endpoint = 'organizations/%s/networks' % self.organizationId
+        return [network['id'] for page in self.__pages(endpoint, 1000)
+                for network in page if productType in network['productTypes']]
+
+    def __networkItems(self, resource: str, networkId: str) -> list[dict]:
+        endpoint = {'ssids': 'networks/%s/wireless/ssids', 'vlans': 'networks/%s/appliance/vlans'}[resource] % networkId
+        statusCode, response = self.apiCall(endpoint)
+        if statusCode != 200: raise LookupError('unable to get %s of network %s; error: %s' % (resource, networkId, statusCode))
+        return [item | {'networkId': networkId} for item in response]
+
+    def __networkRows(self, resource: str, done, networkIds: dict, errors: dict) -> list[list]:
+        try:
+            return [toRow(resource, item) for item in done.result()]
+        except Exception as err:
+            errors[networkIds[done]] = err
+            return []
+
+    def iterRows(self, resource: str, maxWorkers: int = 8):
+        """ streams the rows of a resource page by page (or network by network)
+
+        Args:
+            resource (str): 'devices', 'switchPorts', 'ssids', 'vlans', 'policyObjects' or 'policyObjectGroups'
+            maxWorkers (int, optional): networks read at once for per network resources. Defaults to 8.
+
+        Raises:
+            LookupError: a page could not be read, or networks could not be read (by network id in args[1]),
+                raised after the rows of every other network were handed out
+
+        Yields:
+            list[list]: rows of each page
+        """
+        if resource in networkResources:
+            # only maxWorkers networks are in flight, rows are handed out as each network finishes
+            networkIds, errors = {}, {}
+            with ThreadPoolExecutor(max_workers=maxWorkers) as pool:
+                pending = set()
+                for networkId in self.__networkIds(networkResources[resource]):
+                    future = pool.submit(copy_context().run, self.__networkItems, resource, networkId)
+                    networkIds[future] = networkId
+                    pending.add(future)
+                    if len(pending) < maxWorkers: continue
+                    done = next(as_completed(pending))
+                    pending.remove(done)
+                    yield self.__networkRows(resource, done, networkIds, errors)
+                for done in as_completed(pending):
+                    yield self.__networkRows(resource, done, networkIds, errors)
+            if len(errors) > 0:
+                raise LookupError('%s of %i networks could not be exported' % (resource, len(errors)), errors)
+            return
+
+        endpoints = {
+            'devices': ('organizations/%s/devices', 1000),
+            'switchPorts': ('organizations/%s/switch/ports/bySwitch', 50),
+            'policyObjects': ('organizations/%s/policyObjects', 5000),
+            'policyObjectGroups': ('organizations/%s/policyObjects/groups', 1000),
+        }
+        endpoint, perPage = endpoints[resource]
+        for page in self.__pages(endpoint % self.organizationId, perPage):
+            if resource == 'switchPorts':
+                page = [port | {'serial': switch['serial'], 'networkId': (switch.get('network') or {}).get('id')}
+                        for switch in page for port in switch['ports']]
+            yield [toRow(resource, item) for item in page]
+
+    def export(self, resource: str, path: str, format: str = None, chunkSize: int = 5000, maxWorkers: int = 8) -> int:
+        """ exports a resource to a file, at most chunkSize rows are held in memory
+
+        Args:
+            resource (str): 'devices', 'switchPorts', 'ssids', 'vlans', 'policyObjects' or 'policyObjectGroups'
+            path (str): file to write
+            format (str, optional): 'parquet', 'arrow', 'csv' or 'jsonl', if None from the file extension. Defaults to None.
+            chunkSize (int, optional): rows written at once. Defaults to 5000.
+            maxWorkers (int, optional): networks read at once for per network resources. Defaults to 8.
+
+        Raises:
+            LookupError: rows could not be read, the rows that could are still written, see iterRows
+
+        Returns:
+            int: rows written
+        """
+        if format == None: format = os.path.splitext(path)[1].lstrip('.').lower()
+        writer, path = self.__openWriter(path, schemas[resource], format)
+
+        written, chunk = 0, []
+        try:
+            for rows in self.iterRows(resource, maxWorkers):
+                chunk += rows
+                if len(chunk) >= chunkSize:
+                    writer.write(chunk)
+                    written += len(chunk)
+                    chunk = []
+        finally:
+            # rows read before a failure are still written
+            if len(chunk) > 0 or written == 0:
+                writer.write(chunk)
+                written += len(chunk)
+            writer.close()
+        return written
+
+    def exportAll(self, directory: str, format: str = 'parquet', resources: list[str] = None,
+                  chunkSize: int = 5000, maxWorkers: int = 8) -> dict:
+        """ exports every resource into a directory, one file per resource
+
+        Args:
+            directory (str): directory to write into
+            format (str, optional): 'parquet', 'arrow', 'csv' or 'jsonl'. Defaults to 'parquet'.
+            resources (list[str], optional): resources to export, if None all of them. Defaults to None.
+            chunkSize (int, optional): rows written at once. Defaults to 5000.
+            maxWorkers (int, optional): networks read at once for per network resources. Defaults to 8.
+
+        Raises:
+            LookupError: rows of a resource could not be read, see export
+
+        Returns:
+            dict: resource to rows written
+        """
+        os.makedirs(directory, exist_ok=True)
+        return {resource: self.export(resource, os.path.join(directory, '%s.%s' % (resource, format)), format, chunkSize, maxWorkers)
+                for resource in resources or schemas.keys()}
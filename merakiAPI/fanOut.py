@@ -0,0 +1,55 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextvars import copy_context
+from typing import Callable
+
+class FanOutResult():
+    """ results and errors of a fan out, keyed by serial (or whatever key the fan out used) """
+    def __init__(self) -> None:
+        self.results = {}
+        self.errors = {}
+
+    def __repr__(self) -> str:
+        return "Fan Out Result: %i results, %i errors" % (len(self.results), len(self.errors))
+
+    def __getitem__(self, key):
+        return self.results[key]
+
+    def __contains__(self, key) -> bool:
+        return key in self.results
+
+    def __len__(self) -> int:
+        return len(self.results) + len(self.errors)
+
+    @property
+    def ok(self) -> bool:
+        return len(self.errors) == 0
+
+def fanOut(items: list, call: Callable, key: Callable = lambda item: item.serial, maxWorkers: int = 8) -> FanOutResult:
+    """ runs call on every item at the same time, at most maxWorkers at once
+
+    Every call still spends from the rate budget of its api key (or the one set with useRateBudget),
+    so raising maxWorkers never goes over the rate limit, it only keeps more calls waiting.
+
+    Args:
+        items (list): items to run call on ex: list of camera objects
+        call (Callable): function taking one item
+        key (Callable, optional): key of the item in the result. Defaults to the item serial.
+        maxWorkers (int, optional): max calls running at once. Defaults to 8.
+
+    Returns:
+        FanOutResult: results and exceptions by key
+    """
+    fanOutResult = FanOutResult()
+    items = list(items)
+    if len(items) == 0: return fanOutResult
+
+    with ThreadPoolExecutor(max_workers=max(1, min(maxWorkers, len(items)))) as pool:
+        # each call runs in a copy of the caller's context so useRateBudget carries into the workers
+        futures = {pool.submit(copy_context().run, call, item): key(item) for item in items}
+        for future in as_completed(futures):
+            try:
+                fanOutResult.results[futures[future]] = future.result()
+            except Exception as err:
+                fanOutResult.errors[futures[future]] = err
+
+    return fanOutResult
@@ -0,0 +1,84 @@
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from typing import Callable, Union
+from .merakiObject import _MerakiObject
+from .organization import Organization
+from .fanOut import FanOutResult
+from .rateBudget import RateBudget, useRateBudget
+from .organizationDirectory import _OrganizationDirectory
+
+def _runOrganization(apiKey: str, organizationId: str, name: str, call: Callable, rate: float, lazy: bool):
+    """ builds the organization from its id (names are not unique) and runs call on it, spending from a rate budget of its own
+    """
+    with useRateBudget(RateBudget(rate)):
+        return call(Organization(apiKey, name, lazy=lazy, id=organizationId))
+
+class Fleet(_MerakiObject):
+    def __init__(self, apiKeys: Union[str, list[str]], organizations: list[str] = None) -> None:
+        """ init fleet object, many organizations seen by one or more api keys
+
+        Args:
+            apiKeys (Union[str, list[str]]): api key or list of api keys
+            organizations (list[str], optional): names or ids of organizations to use, if None every organization the keys see. Defaults to None.
+        """
+        self.apiKeys = [apiKeys] if isinstance(apiKeys, str) else list(apiKeys)
+        super().__init__(self.apiKeys[0])
+        self.organizations = self.__getOrganizations(organizations)
+
+    def __repr__(self) -> str:
+        return "Fleet: %i organizations, %i api keys" % (len(self.organizations), len(self.apiKeys))
+
+    def __getOrganizations(self, wanted: list[str]) -> dict:
+        """ organization id to (name, api key), each organization goes to the key seeing the fewest organizations so far
+        """
+        seenBy = {}
+        for apiKey in self.apiKeys:
+            for org in _OrganizationDirectory.forKey(apiKey).organizations():
+                if wanted == None or org['id'] in wanted or org['name'] in wanted:
+                    seenBy.setdefault(org['id'], (org['name'], []))[1].append(apiKey)
+
+        organizations, load = {}, {apiKey: 0 for apiKey in self.apiKeys}
+        for orgId, (name, apiKeys) in seenBy.items():
+            apiKey = min(apiKeys, key=lambda key: load[key])
+            load[apiKey] += 1
+            organizations[orgId] = (name, apiKey)
+
+        if wanted != None:
+            missing = [org for org in wanted if org not in organizations and org not in [name for name, _ in organizations.values()]]
+            if len(missing) > 0: print('Organizations not found:', missing)
+        return organizations
+
+    def run(self, call: Callable, maxWorkers: int = 8, processes: bool = False, rate: float = 10, lazy: bool = True):
+        """ runs call on every organization at the same time and yields the results as they finish,
+        each organization spends from its own rate budget
+
+        Args:
+            call (Callable): function taking an Organization object, must be picklable with processes
+            maxWorkers (int, optional): organizations processed at once. Defaults to 8.
+            processes (bool, optional): use a process pool instead of a thread pool. Defaults to False.
+            rate (float, optional): calls per second of each organization. Defaults to 10.
+            lazy (bool, optional): build the organizations lazily, see Organization. Defaults to True.
+
+        Yields:
+            tuple: organization id, result of call and the exception (or None)
+        """
+        Pool = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        with Pool(max_workers=maxWorkers) as pool:
+            futures = {pool.submit(_runOrganization, apiKey, orgId, name, call, rate, lazy): orgId
+                       for orgId, (name, apiKey) in self.organizations.items()}
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result(), None
+                except Exception as err:
+                    yield futures[future], None, err
+
+    def runAll(self, call: Callable, maxWorkers: int = 8, processes: bool = False, rate: float = 10, lazy: bool = True) -> FanOutResult:
+        """ runs call on every organization and waits for all of them, see run
+
+        Returns:
+            FanOutResult: results and errors by organization id
+        """
+        fleetResult = FanOutResult()
+        for orgId, result, err in self.run(call, maxWorkers, processes, rate, lazy):
+            if err != None: fleetResult.errors[orgId] = err
+            else: fleetResult.results[orgId] = result
+        return fleetResult
@@ -0,0 +1,208 @@
+from bisect import bisect_left, bisect_right, insort
+from ipaddress import ip_address, ip_network
+from threading import RLock
+from .merakiObject import _MerakiObject
+from .fanOut import fanOut, FanOutResult
+from .actionBatch import _ActionBatches
+from .organizationObjects import _NetworkCatalog
+
+class _IpamPlanner(_MerakiObject):
+    def __init__(self, apiKey: str, organizationId: str, supernets: list[str] = None, maxWorkers: int = 8) -> None:
+        """ init ipam planner, indexes the subnet of every appliance VLAN of the organization and
+        allocates new subnets from the supernets
+
+        Args:
+            apiKey (str): api key of user
+            organizationId (str): organization id
+            supernets (list[str], optional): address space new subnets are allocated from ex: ['10.0.0.0/8']. Defaults to None.
+            maxWorkers (int, optional): networks whose VLANs are downloaded at once. Defaults to 8.
+        """
+        super().__init__(apiKey)
+        self.organizationId = organizationId
+        self.supernets = [ip_network(supernet) for supernet in supernets or []]
+        self.maxWorkers = maxWorkers
+        self.entries = [] # used subnets sorted by first address: (start, end, prefixLength, networkId, vlanId, name)
+        self.byNetwork = {} # (first address, prefix length) to its entries, to find the subnets containing another one
+        self.__lock = RLock()
+
+    def __repr__(self) -> str:
+        return "Ipam Planner org: %s, %i subnets, supernets: %s" % (self.organizationId, len(self.entries), [str(s) for s in self.supernets])
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __entry(self, entry: tuple) -> dict:
+        start, end, prefixLength, networkId, vlanId, name = entry
+        return {'subnet': '%s/%i' % (ip_address(start), prefixLength), 'networkId': networkId, 'vlanId': vlanId, 'name': name}
+
+    # ------------- Index ------------- #
+    def add(self, subnet: str, networkId: str = None, vlanId: int = None, name: str = None) -> None:
+        """ adds a subnet in use to the index
+
+        Args:
+            subnet (str): subnet ex: 10.10.10.0/24
+            networkId (str, optional): network of the subnet. Defaults to None.
+            vlanId (int, optional): VLAN of the subnet. Defaults to None.
+            name (str, optional): name of the VLAN. Defaults to None.
+        """
+        network = ip_network(subnet, strict=False)
+        entry = (int(network.network_address), int(network.broadcast_address), network.prefixlen, networkId, vlanId, name)
+        with self.__lock:
+            insort(self.entries, entry, key=lambda e: e[0])
+            self.byNetwork.setdefault((entry[0], entry[2]), []).append(entry)
+
+    def load(self) -> FanOutResult:
+        """ downloads the VLANs of every appliance network of the organization into the index,
+        networks with VLANs off (or no access) are in the errors
+
+        Returns:
+            FanOutResult: number of VLANs by network id
+        """
+        networks = [network for network in _NetworkCatalog.forOrganization(self._apiKey, self.organizationId).items() or []
+                    if 'appliance' in network['productTypes']]
+
+        def loadNetwork(network: dict) -> int:
+            statusCode, response = self.apiCall('networks/%s/appliance/vlans' % network['id'])
+            if statusCode != 200: raise LookupError('unable to get VLANs of %s; error: %s' % (network['name'], statusCode))
+            for vlan in response:
+                if vlan.get('subnet') != None: self.add(vlan['subnet'], network['id'], vlan['id'], vlan['name'])
+            return len(response)
+
+        with self.__lock:
+            self.entries, self.byNetwork = [], {}
+        return fanOut(networks, loadNetwork, key=lambda network: network['id'], maxWorkers=self.maxWorkers)
+
+    # ------------- Queries ------------- #
+    def overlapping(self, subnet: str) -> list[dict]:
+        """ subnets in use overlapping subnet, those inside it and those containing it
+
+        Args:
+            subnet (str): subnet ex: 10.10.0.0/16
+
+        Returns:
+            list[dict]: {'subnet', 'networkId', 'vlanId', 'name'} of each
+        """
+        network = ip_network(subnet, strict=False)
+        start, end = int(network.network_address), int(network.broadcast_address)
+        with self.__lock:
+            # subnets are either nested or apart, so an overlap starts inside subnet or is one of its supernets
+            inside = self.entries[bisect_left(self.entries, start, key=lambda e: e[0]):bisect_right(self.entries, end, key=lambda e: e[0])]
+            containing = []
+            for prefixLength in range(network.prefixlen):
+                hostBits = network.max_prefixlen - prefixLength
+                containing += self.byNetwork.get((start >> hostBits << hostBits, prefixLength), [])
+        return [self.__entry(entry) for entry in containing + inside]
+
+    def isFree(self, subnet: str) -> bool:
+        """ if no subnet in use overlaps subnet
+        """
+        return len(self.overlapping(subnet)) == 0
+
+    def conflicts(self) -> list[tuple[dict, dict]]:
+        """ pairs of subnets of different networks that overlap (same subnet included)
+
+        Returns:
+            list[tuple[dict, dict]]: overlapping pairs
+        """
+        conflicts, active = [], []
+        with self.__lock:
+            for entry in self.entries:
+                active = [other for other in active if other[1] >= entry[0]]
+                conflicts += [(self.__entry(other), self.__entry(entry)) for other in active if other[3] != entry[3]]
+                active.append(entry)
+        return conflicts
+
+    # ------------- Allocation ------------- #
+    def __nextFree(self, supernet, size: int, used: list[tuple[int, int]]) -> int:
+        """ first aligned block of size addresses in supernet not overlapping used (sorted disjoint intervals)
+        """
+        candidate = int(supernet.network_address)
+        last = int(supernet.broadcast_address)
+        i = 0
+        while candidate + size - 1 <= last:
+            i = bisect_left(used, candidate, lo=i, key=lambda interval: interval[1]) # first interval ending at or after candidate
+            if i == len(used) or used[i][0] > candidate + size - 1: return candidate
+            candidate = (used[i][1] // size + 1) * size # next aligned block after the interval
+        return None
+
+    def __used(self) -> list[tuple[int, int]]:
+        used = []
+        for start, end, *_ in self.entries:
+            if len(used) > 0 and start <= used[-1][1] + 1: used[-1] = (used[-1][0], max(used[-1][1], end))
+            else: used.append((start, end))
+        return used
+
+    def allocate(self, prefixLength: int, count: int = 1, supernet: str = None, networkId: str = None,
+                 vlanId: int = None, name: str = None) -> list[str]:
+        """ allocates free subnets from the supernets, the subnets are added to the index right away
+
+        Args:
+            prefixLength (int): size of the subnets ex: 24
+            count (int, optional): number of subnets. Defaults to 1.
+            supernet (str, optional): only allocate from this supernet, if None from the first one with room. Defaults to None.
+            networkId (str, optional): network the subnets are for. Defaults to None.
+            vlanId (int, optional): VLAN the subnets are for. Defaults to None.
+            name (str, optional): name of the VLAN. Defaults to None.
+
+        Raises:
+            ValueError: not enough room in the supernets
+
+        Returns:
+            list[str]: allocated subnets
+        """
+        supernets = [ip_network(supernet)] if supernet != None else self.supernets
+        allocated = []
+        with self.__lock:
+            used = self.__used()
+            for _ in range(count):
+                for network in supernets:
+                    if prefixLength < network.prefixlen: continue
+                    size = 2 ** (network.max_prefixlen - prefixLength)
+                    start = self.__nextFree(network, size, used)
+                    if start != None: break
+                else:
+                    raise ValueError('no free /%i left in %s' % (prefixLength, [str(s) for s in supernets]))
+
+                subnet = '%s/%i' % (ip_address(start), prefixLength)
+                self.add(subnet, networkId, vlanId, name)
+                insort(used, (start, start + size - 1))
+                allocated.append(subnet)
+        return allocated
+
+    def plan(self, vlans: list[dict]) -> list[dict]:
+        """ allocates a subnet and appliance ip (first host) for every VLAN to create
+
+        Args:
+            vlans (list[dict]): {'networkId', 'id', 'name', 'prefixLength'} and optionally 'supernet' and 'additionalOptions'
+
+        Returns:
+            list[dict]: the VLANs with 'subnet' and 'applianceIp' set
+        """
+        planned = []
+        for vlan in vlans:
+            subnet = self.allocate(vlan['prefixLength'], 1, vlan.get('supernet'), vlan['networkId'], vlan['id'], vlan['name'])[0]
+            applianceIp = str(next(ip_network(subnet).hosts()))
+            planned.append(vlan | {'subnet': subnet, 'applianceIp': applianceIp})
+        return planned
+
+    def createVLANs(self, planned: list[dict], chunkSize: int = 100, maxConcurrent: int = 5) -> FanOutResult:
+        """ creates planned VLANs as organization action batches
+
+        Args:
+            planned (list[dict]): VLANs from plan
+            chunkSize (int, optional): VLANs per action batch (100 max). Defaults to 100.
+            maxConcurrent (int, optional): batches running at once. Defaults to 5.
+
+        Returns:
+            FanOutResult: finished batch by chunk start index, or the error of the chunk
+        """
+        actions = []
+        for vlan in planned:
+            body = {'id': vlan['id'], 'name': vlan['name'], 'subnet': vlan['subnet'], 'applianceIp': vlan['applianceIp']}
+            body |= vlan.get('additionalOptions') or {}
+            actions.append({
+                'resource': '/networks/%s/appliance/vlans' % vlan['networkId'],
+                'operation': 'create',
+                'body': body
+            })
+        return _ActionBatches(self._apiKey, self.organizationId).run(actions, chunkSize, maxConcurrent)
@@ -1,7 +1,11 @@
 # import requests
-from requests import request, exceptions
+from requests import exceptions
+from time import sleep
+from .rateBudget import currentRateBudget
+from .retry import getRetryPolicy, currentRetryBudget, idempotentMethods
+from .transport import getTransport
+from .codec import decode, acceptEncoding
 
-_verify = False
 class _MerakiObject():
     def __init__(self, apiKey: str) -> None:
         """ _meraki object inti
@@ -12,59 +16,153 @@ class _MerakiObject():
         self._url = 'https://api.meraki.com/api/v1/%s' # endpoint of meraki api
         self._apiKey = apiKey
     
-    def apiCall(self, endpoint: str, payload: dict = {}, method: str = 'GET'):
+    def _spendBudget(self) -> None:
+        """ waits for the rate budget of the api key before a call
+        """
+        currentRateBudget(self._apiKey).acquire()
+    
+    def _send(self, method: str, url: str, safe: bool = None, **kwargs):
+        """ sends a request through the transport in use, retrying rate limits, server errors and connection errors 
+        with exponential backoff
+
+        Args:
+            method (str): http method
+            url (str): full url
+            safe (bool, optional): if the request can be sent twice, if None only GET, PUT and DELETE are. Defaults to None.
+
+        Returns:
+            tuple: response (None if never received) and the last connection error
+        """
+        policy = getRetryPolicy()
+        if safe == None: safe = method in idempotentMethods
+        
+        attempt = 0
+        while True:
+            response, error = None, None
+            try:
+                transport = getTransport()
+                if getattr(transport, 'rateLimited', True): self._spendBudget() # transports not subclassing Transport reach meraki
+                response = transport.send(method, url, **kwargs)
+            except (exceptions.ConnectionError, exceptions.Timeout) as err:
+                error = err
+            
+            # a 429 was never processed so it is safe to send again whatever the method
+            retryable = (response == None and safe) or \
+                        (response != None and response.status_code in policy.retryStatusCodes and (safe or response.status_code == 429))
+            if not retryable or attempt >= policy.retries: return response, error
+            
+            budget = currentRetryBudget()
+            if budget != None and not budget.spend(): return response, error
+            
+            retryAfter = None
+            if response != None and response.headers.get('Retry-After') != None:
+                try: retryAfter = float(response.headers['Retry-After'])
+                except ValueError: pass
+            sleep(policy.delay(attempt, retryAfter))
+            attempt += 1
+    
+    def _json(self, response):
+        """ body of response, None if it is empty or not json
+        """
+        if len(response.content) == 0: return None
+        try:
+            return decode(response.content, response.headers.get('Content-Encoding'))
+        except ValueError:
+            return None
+    
+    def apiCall(self, endpoint: str, payload: dict = {}, method: str = 'GET', safe: bool = None):
         """ send an api call to meraki api
 
         Args:
             endpoint (str): endpoint of the api
             payload (dict, optional): payload for the api call. Defaults to {}.
             method (str, optional): method to use 'POST' or 'PUT'. Defaults to 'GET'.
+            safe (bool, optional): set True to let a POST be retried, GET, PUT and DELETE always are. Defaults to None.
 
         Returns:
-            _type_: _description_
+            tuple: status code and json body (both None if meraki could not be reached)
         """
         headers = {
             'X-Cisco-Meraki-API-Key': self._apiKey,
             'Content-Type': 'application/json',
-            'Accept': 'application/json'
+            'Accept': 'application/json',
+            'Accept-Encoding': acceptEncoding
         }
         
         # API call error correction
+        response, error = self._send(method, self._url % endpoint, safe, headers=headers, json=payload)
+        if response == None:
+            print(error)
+            print('Unable to reach Meraki.')
+            return None, None
+        
         try: # API call
-            response = request(method, self._url % endpoint, headers=headers, json=payload, verify=_verify)
             response.raise_for_status()
         except exceptions.HTTPError as err: # Error handling
             if response.status_code == 400:
-                print(err, response.json())
+                print(err, self._json(response))
                 print('Client error')
             elif response.status_code == 401:
-                print(err, response.json())
+                print(err, self._json(response))
                 print(f'API Key {self._apiKey} is invalid. Please check your API key and try again.')
             elif response.status_code == 403:
-                print(err, response.json())
+                print(err, self._json(response))
                 print('You do not have permission to perform this action.')
             elif response.status_code == 404:
-                print(err, response.json())
+                print(err, self._json(response))
                 print('Resource does not exist')
             elif response.status_code == 429:
-                print(err, response.json())
+                print(err, self._json(response))
                 print('You have exceeded your rate limit. Please wait and try again.')
             elif response.status_code >= 500:
-                print(err, response.json())
+                print(err, self._json(response))
                 print('Meraki was unable to process your request.')
             else:
-                print(err, response.json())
+                print(err, self._json(response))
+        
+        return response.status_code, self._json(response)
+    
+    def _iterPages(self, endpoint: str, params: dict = None):
+        """ iterate over the pages of a paginated endpoint, following the Link header
+
+        Args:
+            endpoint (str): endpoint of the api
+            params (dict, optional): query parameters for the first page (perPage, timespan, ...). Defaults to None.
+
+        Yields:
+            tuple: status code and the list of items of each page
+        """
+        headers = {
+            'X-Cisco-Meraki-API-Key': self._apiKey,
+            'Accept': 'application/json',
+            'Accept-Encoding': acceptEncoding
+        }
         
-        return response.status_code, response.json()
+        url = self._url % endpoint
+        while url != None:
+            response, error = self._send('GET', url, headers=headers, params=params)
+            if response == None or response.status_code != 200:
+                statusCode = response.status_code if response != None else None
+                print('Unable to get page of %s; error: %s' % (endpoint, statusCode if response != None else error))
+                yield statusCode, []
+                return
+            
+            yield response.status_code, self._json(response) or []
+            
+            # next page url already carries the query string
+            url = response.links.get('next', {}).get('url')
+            params = None
     
-    def _apiJsonErrorCall(self, endpoint, payload):
+    def _apiJsonErrorCall(self, endpoint, payload, safe: bool = False):
         headers = {
             'X-Cisco-Meraki-API-Key': self._apiKey,
             'Content-Type': 'application/json',
-            'Accept': 'application/json'
+            'Accept': 'application/json',
+            'Accept-Encoding': acceptEncoding
         }
         
-        response = request('POST', self._url % endpoint, headers=headers, json=payload, verify=_verify)
+        response, error = self._send('POST', self._url % endpoint, safe, headers=headers, json=payload)
+        if response == None: return None
         return response.status_code
         
     def _delete(self, endpoint: str) -> any:
@@ -76,8 +174,9 @@ class _MerakiObject():
         Returns:
             any: response
         """
-        headers = {'X-Cisco-Meraki-API-Key': self._apiKey}
-        response = request('DELETE', self._url % endpoint, headers=headers, verify=_verify)
+        headers = {'X-Cisco-Meraki-API-Key': self._apiKey, 'Accept-Encoding': acceptEncoding}
+        response, error = self._send('DELETE', self._url % endpoint, headers=headers)
+        if response == None: raise error
         return response
     
     def _changeOctet(cidr, octet, newValue) -> str:
@@ -1,6 +1,14 @@
-from typing import Union
+from typing import Callable, Union
 from .merakiObject import _MerakiObject
-from .device import Device
+from .device import Device, _settingsHash
+from .clientTable import ClientTable
+from .fanOut import fanOut, FanOutResult
+from .actionBatch import _ActionBatches
+from .portStatusPoller import _PortStatusPoller
+from .backgroundRefresher import _BackgroundRefresher
+from .refresh import RefreshResult
+from .organizationObjects import _TemplateCatalog, _NetworkCatalog
+from .organizationDirectory import _OrganizationDirectory
 from .productTypes import _Appliance, _Camera, _Sensor, _Switch, _Wireless
 
 class Network(_MerakiObject):
@@ -9,12 +17,15 @@ class Network(_MerakiObject):
 
         Args:
             apiKey (str): api key of user
-            organizationId (str, optional): organization id of network. Defaults to None.
+            organizationId (str, optional): organization id (or name) of network. Defaults to None.
             name (str, optional): name of network. Defaults to None.
             id (str, optional): id of network. Defaults to None.
         """
         super().__init__(apiKey)
         
+        if organizationId != None:
+            organizationId = self.__resolveOrganizationId(organizationId)
+        
         if name == None and id == None:
             if organizationId == None: return
             else: self.organizationId = organizationId
@@ -30,31 +41,60 @@ class Network(_MerakiObject):
     def __repr__(self):
         return "Name: %s, ID: %s, Product Types: [%s]" % (self.name, self.id, ','.join(self.productTypes))
     
+    _applianceStale = False
+    
+    @property
+    def appliance(self) -> _Appliance:
+        """ appliance of network, built again on first use after invalidateAppliance
+        """
+        if self._applianceStale:
+            self._applianceStale = False
+            self._appliance = _Appliance(self._apiKey, self.id)
+        if getattr(self, '_appliance', None) == None: raise AttributeError('Network has no appliance')
+        return self._appliance
+    
+    @appliance.setter
+    def appliance(self, appliance: _Appliance) -> None:
+        self._applianceStale = False
+        self._appliance = appliance
+    
+    def invalidateAppliance(self) -> None:
+        """ marks the appliance settings (VLANs, firewall) as out of date, they are loaded again on next use
+        """
+        if 'appliance' in getattr(self, 'productTypes', []): self._applianceStale = True
+    
     # ------------- Network ------------- #
+    def __resolveOrganizationId(self, organization: str) -> str:
+        """ organization id from an id or a name, through the organization directory shared by the api key
+        """
+        if organization.isdigit(): return organization # already an id
+        directory = _OrganizationDirectory.forKey(self._apiKey)
+        directory.load()
+        if organization in directory.byId or organization not in directory.byName: return organization
+        return directory.byName[organization]['id']
+    
     def __getNetwork(self, id: str = None, name: str = None) -> None:
-        """ gets the network object from id or orgId and name
+        """ gets the network object from id or orgId and name, names are looked up in the network catalog shared by the org
 
         Args:
             id (str, optional): id of network. Defaults to None.
             name (str, optional): name of network. Defaults to None.
         """
         if id != None: 
-            endpoint = 'networks/%s' % id
+            statusCode, network = self.apiCall('networks/%s' % id)
+            if statusCode != 200: return None
+            self.organizationId = network['organizationId']
         else: 
-            endpoint = 'organizations/%s/networks' % self.organizationId
-            
-        statusCode, response = self.apiCall(endpoint, self._apiKey)
-        if statusCode != 200: return None
+            network = _NetworkCatalog.forOrganization(self._apiKey, self.organizationId).get(name=name)
+            if network == None: return None
         
-        for network in response:
-            if name == network['name']:
-                self.name = network['name']
-                self.id = network['id']
-                self.productTypes = network['productTypes']
-                self.timeZone = network['timeZone']
-                self.tags = network['tags']
-                self.url = network['url']
-                self.notes = network['notes']
+        self.name = network['name']
+        self.id = network['id']
+        self.productTypes = network['productTypes']
+        self.timeZone = network['timeZone']
+        self.tags = network['tags']
+        self.url = network['url']
+        self.notes = network['notes']
                 
         if 'appliance' in self.productTypes: self.appliance = _Appliance(self._apiKey, self.id)
                 
@@ -94,27 +134,22 @@ class Network(_MerakiObject):
         self.url = response['url']
         self.notes = response['notes']
 
+        _NetworkCatalog.forOrganization(self._apiKey, self.organizationId).add(response)
         print(f"Created network {self.name} with id {response['id']}")
         if 'appliance' in self.productTypes: self.appliance = _Appliance(self._apiKey, self.id)
         return self.id
                 
     # ------------- Templates ------------- #      
     def getTemplateNames(self) -> list:
-        """ gets a list of template names in org
+        """ gets a list of template names in org, from the template catalog shared by the org
 
         Returns:
             list: list of template names
         """
-        endpoint = 'organizations/%s/configTemplates' % self.organizationId
-     
-        statusCode, response = self.apiCall(endpoint)
-        if statusCode != 200: 
-            return None
-        
-        return [t['name'] for t in response]
+        return _TemplateCatalog.forOrganization(self._apiKey, self.__getOrganizationId()).names()
     
     def __getTemplateId(self, templateName: str) -> str:
-        """ gets template id from name
+        """ gets template id from name, from the template catalog shared by the org
 
         Args:
             templateName (str): name of the template
@@ -122,15 +157,7 @@ class Network(_MerakiObject):
         Returns:
             str: id of template
         """
-        endpoint = 'organizations/%s/configTemplates' % self.organizationId
-     
-        statusCode, response = self.apiCall(endpoint)
-        if statusCode != 200: 
-            return
-        
-        for t in response:
-            if templateName == t['name']:
-                return t['id']
+        return _TemplateCatalog.forOrganization(self._apiKey, self.__getOrganizationId()).getId(templateName)
     
     def bindTemplate(self, templateName: str, autoBind: bool = False) -> None:
         """ bind the network to a template
@@ -177,7 +204,7 @@ class Network(_MerakiObject):
         """
         self.bindTemplate(templateName, autoBind)    
         self.unbindTemplate()
-        if 'appliance' in self.productTypes: self.appliance = _Appliance(self._apiKey, self.id)
+        self.invalidateAppliance()
     
     # ------------- Appliance ------------- # -- Tested
     def getVlans(self) -> list:
@@ -276,6 +303,35 @@ class Network(_MerakiObject):
             if vlan.name == name or vlan.id == id:
                 vlan.reserveIpRange(start, end, comment, keepOld)
     
+    def updateVLANReservedIpRanges(self, update: Callable, maxWorkers: int = 8) -> FanOutResult:
+        """ changes the reserved ip ranges of every VLAN at once, one PUT per VLAN whose ranges changed
+
+        Args:
+            update (Callable): function taking the VLAN object and its _IpRangeSet, changes the set in place
+                ex: lambda vlan, ranges: ranges.add(vlan.applianceIp, vlan.applianceIp, 'appliance')
+            maxWorkers (int, optional): VLANs updated at once. Defaults to 8.
+
+        Returns:
+            FanOutResult: status code and response by VLAN id, errors (bad ranges) by VLAN id
+        """
+        return fanOut(self.appliance.vlans or [], lambda vlan: vlan.updateReservedIpRanges(lambda ranges: update(vlan, ranges)),
+                      key=lambda vlan: vlan.id, maxWorkers=maxWorkers)
+    
+    def reserveVLANIpRanges(self, ranges: dict, keepOld: bool = True, maxWorkers: int = 8) -> FanOutResult:
+        """ reserves ip ranges in many VLANs, one PUT per VLAN
+
+        Args:
+            ranges (dict): VLAN id to its ranges [{'start', 'end', 'comment'}]
+            keepOld (bool, optional): keep the ranges already reserved. Defaults to True.
+            maxWorkers (int, optional): VLANs updated at once. Defaults to 8.
+
+        Returns:
+            FanOutResult: status code and response by VLAN id, errors (bad ranges) by VLAN id
+        """
+        vlans = [vlan for vlan in self.appliance.vlans or [] if vlan.id in ranges]
+        return fanOut(vlans, lambda vlan: vlan.reserveIpRanges(ranges[vlan.id], keepOld),
+                      key=lambda vlan: vlan.id, maxWorkers=maxWorkers)
+    
     def changeVLANOctetAndKeepRanges(self, octet: int, newValue: int, name: str = None, id: int = None, allVLANs=False) -> None:
         """ changes the octet and reserved ranges of a VLAN
 
@@ -341,6 +397,32 @@ class Network(_MerakiObject):
         for camera in self.cameras:
             if camera.serial == serial:
                 return camera.getVideoLink()
+    
+    def getVideoLinks(self, serials: list[str] = None, maxWorkers: int = 8) -> FanOutResult:
+        """ gets the video stream links of many cameras at once
+
+        Args:
+            serials (list[str], optional): serials of cameras, if None all cameras. Defaults to None.
+            maxWorkers (int, optional): max cameras asked at once. Defaults to 8.
+
+        Returns:
+            FanOutResult: urls and errors by serial
+        """
+        cameras = [camera for camera in self.cameras if serials == None or camera.serial in serials]
+        return fanOut(cameras, lambda camera: camera.getVideoLink(), maxWorkers=maxWorkers)
+            
+    def getAnalyticsOverviews(self, serials: list[str] = None, maxWorkers: int = 8) -> FanOutResult: # not tested
+        """ gets the analytics overview of many cameras at once
+
+        Args:
+            serials (list[str], optional): serials of cameras, if None all cameras. Defaults to None.
+            maxWorkers (int, optional): max cameras asked at once. Defaults to 8.
+
+        Returns:
+            FanOutResult: analytics overviews and errors by serial
+        """
+        cameras = [camera for camera in self.cameras if serials == None or camera.serial in serials]
+        return fanOut(cameras, lambda camera: camera.getAnalyticsOverview(), maxWorkers=maxWorkers)
             
     def getAnalyticsOverview(self, serial: str = None) -> list[dict]: # not tested
         """ gets the analytics overview of camera
@@ -384,35 +466,81 @@ class Network(_MerakiObject):
                 if wireless.serial == serial:
                     return wireless
                 
+    def __buildDevice(self, device: dict):
+        if 'MV' in device['model']:
+            return 'cameras', _Camera(self._apiKey, device['serial'], payload=device)
+        elif 'MT' in device['model']:
+            return 'sensors', _Sensor(self._apiKey, device['serial'], payload=device)
+        elif 'MR' in device['model']:
+            return 'wireless', _Wireless(self._apiKey, device['serial'], payload=device)
+        elif 'MS' in device['model']:
+            return 'switches', _Switch(self._apiKey, device['serial'], payload=device)
+        else:
+            return 'devices', Device(self._apiKey, device['serial'])
+    
+    def refreshDevices(self, maxWorkers: int = 8) -> RefreshResult:
+        """ lists the devices of network again and diffs them by serial, only new devices are built, removed ones are dropped
+        and changed settings are applied to the existing objects (port tables and pollers holding them stay current),
+        each device list is swapped in once it is built
+
+        Args:
+            maxWorkers (int, optional): max new devices built at once. Defaults to 8.
+
+        Returns:
+            RefreshResult: serials added, changed and removed, and new devices that could not be built in errors,
+                None if the devices could not be listed
+        """
+        statusCode, response = self.apiCall('networks/%s/devices' % self.id)
+        if statusCode != 200: return None
+        
+        result = RefreshResult('devices')
+        listed = {device['serial']: device for device in response}
+        known = {device.serial for device in self.__getDeviceObjects()}
+        built = fanOut([device for serial, device in listed.items() if serial not in known], self.__buildDevice,
+                       key=lambda device: device['serial'], maxWorkers=maxWorkers)
+        result.errors = dict(built.errors)
+        
+        for kind in ['cameras', 'sensors', 'wireless', 'switches']:
+            added = [device for serial, (builtKind, device) in built.results.items() if builtKind == kind]
+            if not hasattr(self, kind) and len(added) == 0: continue
+            
+            kept = []
+            for device in getattr(self, kind, []):
+                if device.serial not in listed:
+                    result.removed.add(device.serial)
+                    continue
+                payload = listed[device.serial]
+                if device.contentHash() != _settingsHash(payload):
+                    device._applyUpdate(payload, replace=True)
+                    result.changed.add(device.serial)
+                kept.append(device)
+            
+            result.added |= {device.serial for device in added}
+            setattr(self, kind, kept + added)
+        return result
+    
     def __getDevices(self) -> list:
         endpoint = 'networks/%s/devices' % self.id
         
         statusCode, response = self.apiCall(endpoint)
-        _devices, _cameras, _sensors, _wireless, _switches = [], [], [], [], []
+        if statusCode != 200: return
+        _devices = {'devices': [], 'cameras': [], 'sensors': [], 'wireless': [], 'switches': []}
 
         for device in response:
-            if 'MV' in device['model']:
-                _cameras.append(_Camera(self._apiKey, device['serial'], payload=device))
-            elif 'MT' in device['model']:
-                _sensors.append(_Sensor(self._apiKey, device['serial'], payload=device))
-            elif 'MR' in device['model']:
-                _wireless.append(_Wireless(self._apiKey, device['serial'], payload=device))
-            elif 'MS' in device['model']:
-                _switches.append(_Switch(self._apiKey, device['serial'], payload=device))
-            else:
-                _devices.append(Device(self._apiKey, device['serial']))
+            kind, _device = self.__buildDevice(device)
+            _devices[kind].append(_device)
 
-        if 'camera' in self.productTypes: self.cameras = _cameras
-        if 'sensor' in self.productTypes: self.sensors = _sensors
-        if 'wireless' in self.productTypes: self.wireless = _wireless
-        if 'switch' in self.productTypes: self.switches = _switches
-        
+        if 'camera' in self.productTypes: self.cameras = _devices['cameras']
+        if 'sensor' in self.productTypes: self.sensors = _devices['sensors']
+        if 'wireless' in self.productTypes: self.wireless = _devices['wireless']
+        if 'switch' in self.productTypes: self.switches = _devices['switches']
     
-    def claimDevices(self, serials: list[str]) -> None:
-        """ claim a list of devices
+    def claimDevices(self, serials: list[str], maxWorkers: int = 8) -> None:
+        """ claim a list of devices, only the claimed devices are added to the network object
 
         Args:
             serials (list[str]): list of all serials to claim
+            maxWorkers (int, optional): max claimed devices loaded at once. Defaults to 8.
         """
         endpoint = 'networks/%s/devices/claim' % self.id
         payload = {
@@ -425,48 +553,111 @@ class Network(_MerakiObject):
             print('Devices Claimed')
         else:
             print('Device not in organization; error:', statusCode)
+            return
+        
+        known = {device.serial for device in self.__getDeviceObjects()}
+        
+        def hydrate(serial: str):
+            statusCode, response = self.apiCall('devices/%s' % serial)
+            if statusCode != 200: raise LookupError('claimed device %s not found' % serial)
+            return self.__buildDevice(response)
+        
+        claimed = fanOut([serial for serial in serials if serial not in known], hydrate, key=lambda serial: serial, maxWorkers=maxWorkers)
+        for serial in serials:
+            if serial not in claimed: continue
+            kind, device = claimed[serial]
+            if kind == 'devices': continue
+            if not hasattr(self, kind): setattr(self, kind, [])
+            getattr(self, kind).append(device)
+    
+    def __getDeviceObjects(self) -> list:
+        return getattr(self, 'cameras', []) + getattr(self, 'sensors', []) + getattr(self, 'wireless', []) + getattr(self, 'switches', [])
+    
+    def __getOrganizationId(self) -> str:
+        if getattr(self, 'organizationId', None) == None:
+            statusCode, response = self.apiCall('networks/%s' % self.id)
+            if statusCode == 200: self.organizationId = response['organizationId']
+        return getattr(self, 'organizationId', None)
+    
+    def bulkUpdateDevices(self, updates: dict, chunkSize: int = 100, maxConcurrent: int = 5) -> dict:
+        """ updates many devices with organization action batches instead of one call per device,
+        accepted updates are applied to the device objects without getting them again
+
+        Args:
+            updates (dict): serial to payload for that device, use the meraki api documentation
+            chunkSize (int, optional): devices per action batch (100 max). Defaults to 100.
+            maxConcurrent (int, optional): action batches running at once (5 max). Defaults to 5.
+
+        Returns:
+            dict: 'updated' and 'failed' lists of serials
+        """
+        serials = list(updates.keys())
+        actions = [{
+            "resource": "/devices/%s" % serial,
+            "operation": "update",
+            "body": updates[serial]
+        } for serial in serials]
+        
+        batches = _ActionBatches(self._apiKey, self.__getOrganizationId()).run(actions, chunkSize, maxConcurrent)
+        
+        devices = {device.serial: device for device in self.__getDeviceObjects()}
+        updated, failed = [], []
+        for start in range(0, len(serials), chunkSize):
+            chunk = serials[start:start + chunkSize]
+            batch = batches.results.get(start)
+            if batch == None or batch['status']['failed']:
+                print('Update Failed for %i devices:' % len(chunk), batch['status']['errors'] if batch != None else batches.errors[start])
+                failed += chunk
+                continue
+            
+            for serial in chunk:
+                if serial in devices: devices[serial]._applyUpdate(updates[serial])
+            updated += chunk
+        
+        return {'updated': updated, 'failed': failed}
     
     def updateDevice(self, update: dict, serials: list[str]):
         """ update a list of devices
 
         Args:
             update (dict): payload for the update, use the meraki api documentation
-            serials (list[str]): list of serials update
+            serials (list[str]): list of serials update, if None all devices
         """
-        
-        for device in self.cameras + self.sensors + self.wireless + self.switches:
-            if serials is None or device.serial in serials:
-                device.update(update)
+        return self.bulkUpdateDevices({device.serial: update for device in self.__getDeviceObjects() 
+                                       if serials is None or device.serial in serials})
                 
     def updateLocation(self, address: str, serials: list[str]):
         """ update the location of a list of devices
 
         Args:
             address (str): new location
-            serials (list[str]): list of serials to update
+            serials (list[str]): list of serials to update, if None all devices
         """
-        for device in self.cameras + self.sensors + self.wireless + self.switches:
-            if serials is None or device.serial in serials:
-                device.update({'address': address})
+        return self.updateDevice({'address': address}, serials)
                 
-    def removeDevice(self, serials: list[str]):
-        """ remove a list of devices
+    def removeDevice(self, serials: list[str], maxWorkers: int = 8):
+        """ remove a list of devices, removed devices are dropped from the network object
 
         Args:
             serials (list[str]): list of serials to remove
+            maxWorkers (int, optional): max devices removed at once. Defaults to 8.
         """
         endpoint = 'networks/%s/devices/remove' % self.id
+        
+        statusCodes = fanOut(serials, lambda serial: self._apiJsonErrorCall(endpoint, {"serial": serial}), 
+                             key=lambda serial: serial, maxWorkers=maxWorkers)
+        
+        removed = set()
         for serial in serials:
-            payload = {"serial": serial}
-            
-            statusCode = self._apiJsonErrorCall(endpoint, payload)
-            
-            if statusCode == 204:
+            if statusCodes.results.get(serial) == 204:
                 print('Device removed from network')
+                removed.add(serial)
             else:
-                print('Device not in network; error:', statusCode)
-            
-        self.devices = self.__getDevices()
+                print('Device not in network; error:', statusCodes.results.get(serial, statusCodes.errors.get(serial)))
+        
+        for kind in ['cameras', 'sensors', 'wireless', 'switches']:
+            if hasattr(self, kind):
+                setattr(self, kind, [device for device in getattr(self, kind) if device.serial not in removed])
                 
     # ------------- Sensors ------------- #
 
@@ -479,8 +670,12 @@ class Network(_MerakiObject):
         Returns:
             list[dict] or dict: metrics
         """
+        # the overview is per network, download it once for every sensor
         if serial == None:
-            return [sensor.getMetrics() for sensor in self.sensors]
+            if len(self.sensors) == 0: return []
+            endpoint = 'networks/%s/sensor/alerts/current/overview/byMetric' % self.id
+            statusCode, overview = self.apiCall(endpoint)
+            return [overview for sensor in self.sensors]
 
         for sensor in self.sensors:
             if sensor.serial == serial:
@@ -563,6 +758,72 @@ class Network(_MerakiObject):
             if switch.serial == serial:
                 return switch.getClients(trunkPorts)
             
+    def getClients(self, timespan: int = 86400, perPage: int = 1000, withoutTrunks: bool = False) -> ClientTable:
+        """ gets every client of the network from the paginated network clients endpoint
+
+        Args:
+            timespan (int, optional): timespan in seconds to look back for clients. Defaults to 86400.
+            perPage (int, optional): clients per page (3 - 5000). Defaults to 1000.
+            withoutTrunks (bool, optional): drop clients seen on the trunk ports of the network switches. Defaults to False.
+
+        Returns:
+            ClientTable: columnar table of clients
+        """
+        endpoint = 'networks/%s/clients' % self.id
+        clients = ClientTable()
+        for statusCode, page in self._iterPages(endpoint, {'timespan': timespan, 'perPage': perPage}):
+            clients.extend(page, self.id)
+        
+        if withoutTrunks and hasattr(self, 'switches'):
+            clients = clients.withoutTrunkPorts({switch.serial: switch.getTrunkPorts() for switch in self.switches})
+        return clients
+            
+    def getPortStatusPoller(self, serials: list[str] = None, interval: float = 60) -> _PortStatusPoller:
+        """ gets a poller that refreshes the port statuses of the switches and reports port changes
+
+        Args:
+            serials (list[str], optional): serials of switches to watch, if None all switches. Defaults to None.
+            interval (float, optional): seconds between polls when started. Defaults to 60.
+
+        Returns:
+            _PortStatusPoller: port status poller, use onChange and start or async for over events()
+        """
+        switches = [switch for switch in self.switches if serials == None or switch.serial in serials]
+        return _PortStatusPoller(self._apiKey, switches, getattr(self, 'organizationId', None), interval)
+            
+    def getBackgroundRefresher(self, intervals: dict = None, onAccess: bool = False) -> _BackgroundRefresher:
+        """ gets a refresher that keeps the devices, SSIDs, VLANs, firewall rules and switch ports of network fresh in the background,
+        the current data is served until the new data is loaded, refreshes wait for room in the rate budget of the api key
+
+        Args:
+            intervals (dict, optional): seconds each resource stays fresh ex: {'ports': 30}, 
+                defaults devices 3600, ssids, vlans and firewall 300, ports 60. Defaults to None.
+            onAccess (bool, optional): only refresh a resource when read with get and stale, instead of on a schedule. Defaults to False.
+
+        Returns:
+            _BackgroundRefresher: refresher, start it or read resources with get ex: get('vlans')
+        """
+        intervals = {'devices': 3600, 'ssids': 300, 'vlans': 300, 'firewall': 300, 'ports': 60} | (intervals or {})
+        refresher = _BackgroundRefresher(self._apiKey, onAccess)
+        
+        refresher.register('devices', self.refreshDevices, 
+                           lambda: {kind: getattr(self, kind) for kind in ['cameras', 'sensors', 'wireless', 'switches'] if hasattr(self, kind)},
+                           intervals['devices'])
+        if 'wireless' in self.productTypes:
+            def refreshSSIDs() -> None:
+                # every access point holds the SSIDs of the network, load them once
+                if len(self.wireless) == 0: return
+                self.wireless[0].refreshSSIDs()
+                for wireless in self.wireless[1:]: wireless.ssids = self.wireless[0].ssids
+            refresher.register('ssids', refreshSSIDs, lambda: self.wireless[0].ssids if len(self.wireless) > 0 else None, intervals['ssids'])
+        if 'appliance' in self.productTypes:
+            refresher.register('vlans', lambda: self.appliance.refreshVLANs(), lambda: getattr(self.appliance, 'vlans', None), intervals['vlans'])
+            refresher.register('firewall', lambda: self.appliance.firewall.refresh(), lambda: self.appliance.firewall.rules, intervals['firewall'])
+        if 'switch' in self.productTypes:
+            refresher.register('ports', lambda: fanOut(self.switches, lambda switch: switch.refreshPorts()),
+                               lambda: {switch.serial: switch.ports for switch in self.switches}, intervals['ports'])
+        return refresher
+    
     def updateSwitchPort(self, serial: str, portId: str, payload: dict) -> None:
         """ Updates a switch port
 
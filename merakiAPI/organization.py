@@ -1,38 +1,260 @@
-from typing import Union
+from typing import Union, Callable
+from time import time
+from threading import Lock, RLock
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 from .merakiObject import _MerakiObject
-from .organizationObjects import _PolicyObject, _PolicyObjectGroup
+from .clientTable import ClientTable
+from .fanOut import fanOut, FanOutResult
+from .sensorReadings import SensorReadings, _SensorReadingsPoller
+from .portStatusPoller import _PortStatusPoller
+from .configurationChanges import _ConfigurationChangeWatcher
+from .exporter import Exporter
+from .portTable import PortTable
+from .templateRollout import _TemplateRollout
+from .ipam import _IpamPlanner
+from .organizationObjects import _PolicyObject, _PolicyObjectGroup, _PolicyObjectIndex, _TemplateCatalog, _NetworkCatalog
+from .organizationObjects.policyObjectIndex import addressKey
 from .productTypes import _Switch
+from .network import Network
+from .organizationDirectory import _OrganizationDirectory
+from .refresh import refreshObjects
+from .backgroundRefresher import _BackgroundRefresher
+
+_missing = object() # collection not loaded, None is a collection that failed to load
+_keyLockStripes = 64 # locks policy object addresses and group names are spread over
 ############### Tested ###############
  
 class Organization(_MerakiObject): 
-    def __init__(self, apiKey: str, name: str) -> None: 
+    def __init__(self, apiKey: str, name: str, lazy: bool = False, background: bool = False, id: str = None) -> None: 
         """ init organization object
 
         Args:
             apiKey (str): api key of user
             name (str): name of organization (alphanumeric, space, dash, or underscore characters only)
+            lazy (bool, optional): load collections (policy objects, policy object groups) on first use instead of now. Defaults to False.
+            background (bool, optional): with lazy, start loading the collections in background threads right away. Defaults to False.
+            id (str, optional): id of organization, skips the lookup by name (names are not unique across organizations). Defaults to None.
         """
         
         super().__init__(apiKey)
         
         self.name = name
-        self.id = self.__getId()
+        self.id = id if id != None else self.__getId()
+        
+        self.__loaders = {
+            'policyObjects': self.__getPolicyObjects,
+            'policyObjectGroups': self.__getPolicyObjectGroups,
+        }
+        self.__collections = {}
+        self.__pending = {}
+        self.__loadLock = Lock()
+        self.__writeLock = RLock() # serializes swapping in changed collections, readers never wait for it
+        self.__keyLocks = [RLock() for _ in range(_keyLockStripes)] # changes of one policy object or group wait for each other
+        self.__index = None
         
         if self.id == None: return
         
-        self.policyObjects = self.__getPolicyObjects()
-        self.policyObjectGroups = self.__getPolicyObjectGroups()
+        if not lazy:
+            for collection in self.__loaders:
+                self.__load(collection)
+        elif background:
+            pool = ThreadPoolExecutor(max_workers=len(self.__loaders))
+            self.__pending = {collection: pool.submit(copy_context().run, loader) for collection, loader in self.__loaders.items()}
+            pool.shutdown(wait=False)
+    
+    def __load(self, collection: str):
+        """ gets a collection, loading it (or waiting for its background load) the first time
+        """
+        # one read, invalidate may drop the collection from another thread at any time
+        loaded = self.__collections.get(collection, _missing)
+        if loaded is not _missing: return loaded
+        
+        with self.__loadLock:
+            loaded = self.__collections.get(collection, _missing)
+            if loaded is _missing:
+                if collection in self.__pending:
+                    loaded = self.__pending.pop(collection).result()
+                else:
+                    loaded = self.__loaders[collection]()
+                self.__collections[collection] = loaded
+        return loaded
+    
+    def invalidate(self, collection: str) -> None:
+        """ drops a loaded collection so it is loaded again on next use
+
+        Args:
+            collection (str): 'policyObjects', 'policyObjectGroups', 'templates' or 'networks'
+        """
+        if collection == 'templates': return self.templates.invalidate()
+        if collection == 'networks': return self.networks.invalidate()
+        
+        with self.__loadLock:
+            self.__collections.pop(collection, None)
+            self.__pending.pop(collection, None)
+    
+    def __currentIndex(self) -> _PolicyObjectIndex:
+        """ the policy object index if it was built for the current policy objects, else None
+        """
+        index = self.__index
+        return index[1] if index != None and index[0] is self.__collections.get('policyObjects') else None
+    
+    def __keyLock(self, key: tuple) -> RLock:
+        """ lock of one policy object address or group name, held through the api calls changing it
+        so changes of other objects run at the same time. Keys share a fixed set of locks, so never hold
+        two key locks at once
+        """
+        return self.__keyLocks[hash(key) % len(self.__keyLocks)]
+    
+    def __swap(self, collection: str, add: list = None, remove: list = None) -> list:
+        """ copy on write: swaps in a new list of the collection with add and without remove, threads iterating
+        the old list are not affected, the policy object index is kept in step. Takes the write lock
+        (never hold it while calling, the collection may have to be loaded first)
+        """
+        self.__load(collection) # loaded before locking, other writers do not wait for the download
+        with self.__writeLock:
+            loaded = self.__collections.get(collection, _missing)
+            # invalidated since, the next load gets the change from the api
+            if loaded is _missing: return None
+            
+            index = self.__currentIndex()
+            removed = {id(item) for item in remove or []}
+            items = [item for item in loaded or [] if id(item) not in removed] + (add or [])
+            self.__collections[collection] = items
+            if index == None: return items
+            
+            if collection == 'policyObjects':
+                self.__index = (items, index)
+                for item in remove or []: index.remove(item)
+                for item in add or []: index.add(item)
+            else:
+                for item in remove or []: index.removeGroup(item)
+                for item in add or []: index.addGroup(item)
+            return items
+    
+    def refresh(self, collections: list[str] = None) -> dict:
+        """ downloads the collections again and swaps in the updated lists, objects other code holds stay current,
+        collections not loaded yet are skipped
+
+        Args:
+            collections (list[str], optional): 'policyObjects', 'policyObjectGroups', 'templates', 'networks', if None all. Defaults to None.
+
+        Returns:
+            dict: collection to RefreshResult (ids added, changed and removed), None if it could not be downloaded
+        """
+        if collections == None: collections = list(self.__loaders) + ['templates', 'networks']
+        
+        results = {}
+        for collection in collections:
+            if collection in ['templates', 'networks']:
+                catalog = self.templates if collection == 'templates' else self.networks
+                if catalog.loaded: results[collection] = catalog.refresh()
+                continue
+            
+            if collection not in self.__collections or self.__collections[collection] == None: continue
+            fresh = self.__loaders[collection]()
+            if fresh == None:
+                results[collection] = None
+                continue
+            
+            with self.__writeLock:
+                current = self.__collections.get(collection)
+                if current == None: continue # invalidated since
+                
+                # keep the policy object index (if built) in step
+                index = self.__currentIndex()
+                if index == None: onAdd = onRemove = None
+                elif collection == 'policyObjects': onAdd, onRemove = index.add, index.remove
+                else: onAdd, onRemove = index.addGroup, index.removeGroup
+                
+                items = list(current)
+                results[collection] = refreshObjects(collection, items, fresh, onAdd, onRemove)
+                self.__collections[collection] = items
+                if index != None and collection == 'policyObjects': self.__index = (items, index)
+        return results
+    
+    def getBackgroundRefresher(self, intervals: dict = None, onAccess: bool = False) -> _BackgroundRefresher:
+        """ gets a refresher that keeps the collections of organization fresh in the background with refresh,
+        the objects held are updated in place, refreshes wait for room in the rate budget of the api key
+
+        Args:
+            intervals (dict, optional): seconds each collection stays fresh ex: {'networks': 3600}, defaults 300. Defaults to None.
+            onAccess (bool, optional): only refresh a collection when read with get and stale, instead of on a schedule. Defaults to False.
+
+        Returns:
+            _BackgroundRefresher: refresher, start it or read collections with get ex: get('policyObjects')
+        """
+        intervals = intervals or {}
+        refresher = _BackgroundRefresher(self._apiKey, onAccess)
+        for collection in list(self.__loaders) + ['templates', 'networks']:
+            refresher.register(collection, lambda collection=collection: self.refresh([collection]),
+                               lambda collection=collection: getattr(self, collection), intervals.get(collection, 300))
+        return refresher
+    
+    @property
+    def templates(self) -> _TemplateCatalog: 
+        """ config template catalog of organization, shared with every network of organization
+        """
+        return _TemplateCatalog.forOrganization(self._apiKey, self.id)
+    
+    @property
+    def networks(self) -> _NetworkCatalog: 
+        """ network catalog of organization, shared with every network of organization
+        """
+        return _NetworkCatalog.forOrganization(self._apiKey, self.id)
+    
+    @property
+    def policyObjects(self) -> list: 
+        return self.__load('policyObjects')
+    
+    @policyObjects.setter
+    def policyObjects(self, policyObjects: list) -> None: 
+        with self.__writeLock:
+            self.__collections['policyObjects'] = policyObjects
+    
+    @property
+    def policyObjectGroups(self) -> list: 
+        return self.__load('policyObjectGroups')
+    
+    @property
+    def policyObjectIndex(self) -> _PolicyObjectIndex: 
+        """ prefix and fqdn index of the policy objects, built again whenever the policy objects are loaded again
+        ex: policyObjectIndex.covering('10.20.30.40'), policyObjectIndex.coveringGroups('10.20.30.40')
+        """
+        index = self.__index
+        policyObjects, policyObjectGroups = self.policyObjects, self.policyObjectGroups # loaded before locking
+        if index != None and index[0] is policyObjects: return index[1]
+        
+        with self.__writeLock:
+            index = self.__currentIndex() # built by another thread meanwhile
+            if index != None: return index
+            self.__index = (policyObjects, _PolicyObjectIndex(policyObjects, policyObjectGroups))
+            return self.__index[1]
+    
+    @policyObjectGroups.setter
+    def policyObjectGroups(self, policyObjectGroups: list) -> None: 
+        with self.__writeLock:
+            self.__collections['policyObjectGroups'] = policyObjectGroups
     
     def __repr__(self) -> str: 
         return "organization name: %s, organization id: %s" % (self.name, self.id)
     
     def __getId(self): 
-        statusCode, response = self.apiCall('organizations', self._apiKey)
-        if statusCode != 200: return None
-        
-        for org in response:
-            if self.name == org['name']:
-                return org['id']
+        return _OrganizationDirectory.forKey(self._apiKey).getId(self.name)
+
+    def getNetworks(self, names: list[str] = None, maxWorkers: int = 8) -> FanOutResult:
+        """ builds many network objects at once, names are looked up in the shared network catalog (one listing for all of them)
+
+        Args:
+            names (list[str], optional): names of networks, if None every network of organization. Defaults to None.
+            maxWorkers (int, optional): networks built at once. Defaults to 8.
+
+        Returns:
+            FanOutResult: network object or error by name
+        """
+        if names == None: names = self.networks.names() or []
+        self.networks.load()
+        return fanOut(names, lambda name: Network(self._apiKey, self.id, name=name), key=lambda name: name, maxWorkers=maxWorkers)
 
     def getAllNetworkIds(self): 
         """ get networks associated with organization
@@ -68,7 +290,7 @@ class Organization(_MerakiObject):
                 return _PO
        
     
-    def createPolicyObject(self, name: str, type: str, addr: str, groupIds: list[str] = None) -> _PolicyObject: 
+    def createPolicyObject(self, name: str, type: str, addr: str, groupIds: list[str] = None, skipDuplicates: bool = True) -> _PolicyObject: 
         """ creates a new policy object object within organization object
 
         Args:
@@ -76,14 +298,25 @@ class Organization(_MerakiObject):
             type (str): type of policy object ['cidr', 'fqdn']
             addr (str): cidr or fqdn of policy object
             groupIds (list[str]): a list of the groupIds the policy object is a part of
+            skipDuplicates (bool, optional): if an object with the same address exists, add it to the groups instead. Defaults to True.
 
         Returns:
             policy object object or None
         """
         name = name.replace('!', '').replace('@', '').replace('#', '').replace('$', '').replace('%', '').replace('^', '').replace('&', '').replace('*', '').replace('(', '').replace(')', '').replace('+', '').replace('=', '').replace('{', '').replace('}', '').replace('[', '').replace(']', '').replace('|', '').replace('\\', '').replace(':', '').replace(';', '').replace('"', '').replace('\'', '').replace('<', '').replace('>', '').replace(',', '').replace('.', '').replace('?', '').replace('/', '').replace('~', '').replace('`', '')
-        _PO = _PolicyObject(self._apiKey, self.id)
-        self.policyObjects.append(_PO.create(name, type, addr, groupIds))
-        return _PO
+        # the lock of the address is held through the create so two threads never create the same address twice,
+        # creates of other addresses run at the same time
+        with self.__keyLock(addressKey(type, addr)):
+            if skipDuplicates:
+                existing = self.policyObjectIndex.find(type, addr)
+                if len(existing) > 0:
+                    existing[0].addToGroups(groupIds or [])
+                    return existing[0]
+            
+            _PO = _PolicyObject(self._apiKey, self.id)
+            _PO.create(name, type, addr, groupIds)
+            if _PO.id != None: self.__swap('policyObjects', add=[_PO])
+            return _PO
     
     def createWildCardMask(self, name: str, ip: str) -> None: 
         """ create a wildcard mask of policy object spread over two policy object groups
@@ -110,7 +343,7 @@ class Organization(_MerakiObject):
         
         if endingValue - startingValue <= 128:
             if policyObjectGroups == None: 
-                POG = self.createPolicyObjectGroup('%s %s-%s' % (name, startingValue, endingValue))
+                POG = self.__getOrCreatePolicyObjectGroup('%s %s-%s' % (name, startingValue, endingValue))
                 POG = POG.id
             else:
                 POG = policyObjectGroups
@@ -118,9 +351,9 @@ class Organization(_MerakiObject):
                 self.createPolicyObject('%s wildcard-%i' % (name, value), 'cidr', ip.replace('*', str(value)), [POG])
         else:
             if policyObjectGroups == None:
-                POG1 = self.createPolicyObjectGroup('%s %s-127' % (name, startingValue))
+                POG1 = self.__getOrCreatePolicyObjectGroup('%s %s-127' % (name, startingValue))
                 POG1 = POG1.id
-                POG2 = self.createPolicyObjectGroup('%s 128-%s' % (name, endingValue))
+                POG2 = self.__getOrCreatePolicyObjectGroup('%s 128-%s' % (name, endingValue))
                 POG2 = POG2.id
             else:
                 POG1 = POG2 = policyObjectGroups
@@ -139,9 +372,12 @@ class Organization(_MerakiObject):
             str: id of deleted policy object
         """
         for po in self.policyObjects:
-            if po.name == name:
+            if po.name != name: continue
+            # the lock of the address, the one creating it takes
+            with self.__keyLock(addressKey(po.type, po.address)):
+                if not any(current is po for current in self.policyObjects): return # deleted meanwhile
                 po.delete()
-                self.policyObjects.remove(po)
+                self.__swap('policyObjects', remove=[po])
                 return po.id
             
     def __getPolicyObjectGroups(self) -> list: 
@@ -186,8 +422,16 @@ class Organization(_MerakiObject):
         """
         name = name.replace('!', '').replace('@', '').replace('#', '').replace('$', '').replace('%', '').replace('^', '').replace('&', '').replace('*', '').replace('(', '').replace(')', '').replace('+', '').replace('=', '').replace('{', '').replace('}', '').replace('[', '').replace(']', '').replace('|', '').replace('\\', '').replace(':', '').replace(';', '').replace('"', '').replace('\'', '').replace('<', '').replace('>', '').replace(',', '').replace('.', '').replace('?', '').replace('/', '').replace('~', '').replace('`', '')
         _POG = _PolicyObjectGroup(self._apiKey, self.id)
-        self.policyObjectGroups.append(_POG.create(name))
+        _POG.create(name)
+        if _POG.id != None: self.__swap('policyObjectGroups', add=[_POG])
         return _POG
+    
+    def __getOrCreatePolicyObjectGroup(self, name: str):
+        """ the policy object group named name, creates it if there is none
+        """
+        with self.__keyLock(('policyObjectGroup', name)):
+            existing = self.getPolicyObjectGroup(name=name)
+            return existing if existing != None else self.createPolicyObjectGroup(name)
 
     def deletePolicyObjectGroup(self, name: str) -> str: 
         """ deletes policy object group from organization 
@@ -198,11 +442,12 @@ class Organization(_MerakiObject):
         Returns:
             str: policy object group id
         """
-        for pog in self.policyObjectGroups:
-            if pog.name == name:
-                pog.delete()
-                self.policyObjectGroups.remove(pog)
-                return pog.id
+        with self.__keyLock(('policyObjectGroup', name)):
+            for pog in self.policyObjectGroups:
+                if pog.name == name:
+                    pog.delete()
+                    self.__swap('policyObjectGroups', remove=[pog])
+                    return pog.id
             
     def deletePolicyObjectGroupAndObjects(self, name:str) -> list[str]: 
         """ deletes a group and all policy objects in that group
@@ -215,16 +460,14 @@ class Organization(_MerakiObject):
         """
         pog = self.deletePolicyObjectGroup(name)
         removed = []
-        while True:            
-            removedLen = len(removed)
-            for po in self.policyObjects:
-                if pog in po.groupIds:
-                    po.delete()
-                    self.policyObjects.remove(po)
-                    removed.append(po.id)
-            
-            if removedLen == len(removed): break
-        return removed
+        for po in self.policyObjects:
+            if pog not in po.groupIds: continue
+            with self.__keyLock(addressKey(po.type, po.address)):
+                if not any(current is po for current in self.policyObjects): continue # deleted meanwhile
+                po.delete()
+                self.__swap('policyObjects', remove=[po])
+                removed.append(po)
+        return [po.id for po in removed]
         
     def getOrganizationSwitches(self, withTrunks: bool = False): 
         """ returns a list of all switches in organization
@@ -252,4 +495,184 @@ class Organization(_MerakiObject):
         
         if statusCode != 200: return
         
-        return response 
\ No newline at end of file
+        return response
+    
+    def getTrunkPorts(self) -> dict:
+        """ gets the trunk ports of every switch in organization from the paginated ports by switch endpoint
+
+        Returns:
+            dict: switch serial to list of trunk port ids
+        """
+        endpoint = 'organizations/%s/switch/ports/bySwitch' % self.id
+        trunkPorts = {}
+        for statusCode, page in self._iterPages(endpoint, {'perPage': 50}):
+            for switch in page:
+                trunkPorts[switch['serial']] = [str(port['portId']) for port in switch['ports'] if port['type'] == 'trunk']
+        return trunkPorts
+    
+    def getClients(self, networkIds: list[str] = None, timespan: int = 86400, 
+                   withoutTrunks: bool = False, maxWorkers: int = 8) -> ClientTable:
+        """ gets the clients of many networks at once, one worker per network
+
+        Args:
+            networkIds (list[str], optional): networks to collect, if None all networks of organization. Defaults to None.
+            timespan (int, optional): timespan in seconds to look back for clients. Defaults to 86400.
+            withoutTrunks (bool, optional): drop clients seen on switch trunk ports. Defaults to False.
+            maxWorkers (int, optional): number of networks collected at the same time. Defaults to 8.
+
+        Returns:
+            ClientTable: columnar table of clients of all networks
+        """
+        if networkIds == None: networkIds = [network['id'] for network in self.networks.items() or []]
+        
+        def collect(networkId: str) -> ClientTable:
+            endpoint = 'networks/%s/clients' % networkId
+            clients = ClientTable()
+            for statusCode, page in self._iterPages(endpoint, {'timespan': timespan, 'perPage': 1000}):
+                clients.extend(page, networkId)
+            return clients
+        
+        collected = fanOut(networkIds, collect, key=lambda networkId: networkId, maxWorkers=maxWorkers)
+        for networkId, err in collected.errors.items():
+            print('Unable to get clients of network %s; error: %s' % (networkId, err))
+        clients = ClientTable.concat(collected.results[networkId] for networkId in networkIds if networkId in collected)
+        
+        if withoutTrunks:
+            clients = clients.withoutTrunkPorts(self.getTrunkPorts())
+        return clients
+    
+    def getSensorReadingsPoller(self, metrics: list[str] = None, serials: list[str] = None, since: float = None) -> _SensorReadingsPoller:
+        """ gets a poller for the sensor readings history of organization, every poll only pulls readings since the last one
+
+        Args:
+            metrics (list[str], optional): metrics to pull ex: ['temperature', 'humidity'], if None all metrics. Defaults to None.
+            serials (list[str], optional): sensors to pull, if None all sensors. Defaults to None.
+            since (float, optional): epoch seconds to start from, if None the first poll looks back one hour. Defaults to None.
+
+        Returns:
+            _SensorReadingsPoller: sensor readings poller
+        """
+        return _SensorReadingsPoller(self._apiKey, self.id, metrics, serials, since)
+    
+    def getSensorReadings(self, timespan: int = 3600, metrics: list[str] = None, serials: list[str] = None) -> SensorReadings:
+        """ gets the sensor readings history of organization as compact arrays
+
+        Args:
+            timespan (int, optional): seconds to look back. Defaults to 3600.
+            metrics (list[str], optional): metrics to pull, if None all metrics. Defaults to None.
+            serials (list[str], optional): sensors to pull, if None all sensors. Defaults to None.
+
+        Returns:
+            SensorReadings: readings of organization
+        """
+        return self.getSensorReadingsPoller(metrics, serials, time() - timespan).poll()
+    
+    def getPortStatusPoller(self, serials: list[str] = None, interval: float = 60) -> _PortStatusPoller:
+        """ gets a poller for the switch port statuses of organization, polled with the organization statuses by switch endpoint
+
+        Args:
+            serials (list[str], optional): serials of switches to watch, if None all switches of organization. Defaults to None.
+            interval (float, optional): seconds between polls when started. Defaults to 60.
+
+        Returns:
+            _PortStatusPoller: port status poller, use onChange and start or async for over events()
+        """
+        if serials == None:
+            serials = [device['serial'] for device in self.getOrganizationDevices() if 'MS' in device['model']]
+        return _PortStatusPoller(self._apiKey, serials, self.id, interval)
+    
+    def getConfigurationChangeWatcher(self, networks: list = None, since: float = None, interval: float = 300) -> _ConfigurationChangeWatcher:
+        """ gets a watcher of the configuration changes of organization that keeps this organization and the networks up to date
+
+        Args:
+            networks (list, optional): network objects to keep up to date. Defaults to None.
+            since (float, optional): epoch seconds to read changes from, if None from now. Defaults to None.
+            interval (float, optional): seconds between polls when started. Defaults to 300.
+
+        Returns:
+            _ConfigurationChangeWatcher: configuration change watcher, use poll or start
+        """
+        watcher = _ConfigurationChangeWatcher(self._apiKey, self.id, since, interval)
+        watcher.watch(self)
+        for network in networks or []:
+            watcher.watch(network)
+        return watcher
+    
+    def exportInventory(self, directory: str, format: str = 'parquet', resources: list[str] = None, maxWorkers: int = 8) -> dict:
+        """ streams the inventory of organization into one file per resource, see Exporter
+
+        Args:
+            directory (str): directory to write into
+            format (str, optional): 'parquet', 'arrow', 'csv' or 'jsonl', parquet and arrow need pyarrow. Defaults to 'parquet'.
+            resources (list[str], optional): 'devices', 'switchPorts', 'ssids', 'vlans', 'policyObjects', 'policyObjectGroups', if None all. Defaults to None.
+            maxWorkers (int, optional): networks read at once for ssids and vlans. Defaults to 8.
+
+        Raises:
+            LookupError: rows of a resource could not be read, those that could are still written
+
+        Returns:
+            dict: resource to rows written
+        """
+        return Exporter(self._apiKey, self.id).exportAll(directory, format, resources, maxWorkers=maxWorkers)
+    
+    def getIpamPlanner(self, supernets: list[str] = None, load: bool = True, maxWorkers: int = 8) -> _IpamPlanner:
+        """ gets an ipam planner, an index of the subnet of every appliance VLAN of organization that allocates
+        new VLAN subnets from supernets ex: createVLANs(plan([{'networkId': id, 'id': 10, 'name': 'Data', 'prefixLength': 24}]))
+
+        Args:
+            supernets (list[str], optional): address space new subnets are allocated from ex: ['10.0.0.0/8']. Defaults to None.
+            load (bool, optional): download the VLANs of every network now. Defaults to True.
+            maxWorkers (int, optional): networks whose VLANs are downloaded at once. Defaults to 8.
+
+        Returns:
+            _IpamPlanner: ipam planner
+        """
+        planner = _IpamPlanner(self._apiKey, self.id, supernets, maxWorkers)
+        if load:
+            result = planner.load()
+            if len(result.errors) > 0: print('VLANs not indexed for %i networks' % len(result.errors))
+        return planner
+    
+    def getPortTable(self, switches: list = None) -> PortTable:
+        """ gets an indexed table of every switch port of organization and its status
+
+        Args:
+            switches (list, optional): switch objects to build from (their port updates keep the table up to date), 
+                if None uses the organization ports and statuses by switch endpoints. Defaults to None.
+
+        Returns:
+            PortTable: port table
+        """
+        if switches != None: return PortTable(switches)
+        
+        statuses = {}
+        endpoint = 'organizations/%s/switch/ports/statuses/bySwitch' % self.id
+        for statusCode, page in self._iterPages(endpoint, {'perPage': 20}):
+            for switch in page:
+                statuses[switch['serial']] = {str(port['portId']): port for port in switch['ports']}
+        
+        table = PortTable()
+        endpoint = 'organizations/%s/switch/ports/bySwitch' % self.id
+        for statusCode, page in self._iterPages(endpoint, {'perPage': 50}):
+            for switch in page:
+                table.add(switch['serial'], {str(port['portId']): port for port in switch['ports']}, statuses.get(switch['serial']))
+        return table
+    
+    def rolloutTemplate(self, templateName: str, networks: list, autoBind: bool = False, unbind: bool = True,
+                        retainConfigs: bool = True, maxWorkers: int = 5, onProgress: Callable = None):
+        """ binds many networks to a template at once (and unbinds them keeping the configs), the template is looked up once
+
+        Args:
+            templateName (str): name of template
+            networks (list): network objects or network ids
+            autoBind (bool, optional): autoBind setting of the bind. Defaults to False.
+            unbind (bool, optional): unbind right after binding. Defaults to True.
+            retainConfigs (bool, optional): keep the template configs when unbinding. Defaults to True.
+            maxWorkers (int, optional): networks rolled out at once. Defaults to 5.
+            onProgress (Callable, optional): called with network id, step, networks finished and networks started. Defaults to None.
+
+        Returns:
+            FanOutResult: result or error by network id
+        """
+        rollout = _TemplateRollout(self._apiKey, self.id, templateName)
+        return rollout.run(networks, autoBind, unbind, retainConfigs, maxWorkers, onProgress)
@@ -0,0 +1,150 @@
+import json
+import os
+from hashlib import sha256
+from threading import Lock
+from time import time
+from .merakiObject import _MerakiObject
+
+_settings = {'ttl': 3600, 'cacheDirectory': None}
+
+def configureOrganizationDirectory(ttl: float = 3600, cacheDirectory: str = None) -> None:
+    """ sets how long the organizations seen by an api key are kept, and where they are kept on disk
+
+    Args:
+        ttl (float, optional): seconds before the organizations are listed again. Defaults to 3600.
+        cacheDirectory (str, optional): directory to keep the organizations in between runs, if None memory only. Defaults to None.
+    """
+    _settings['ttl'] = ttl
+    _settings['cacheDirectory'] = cacheDirectory
+
+def fingerprint(apiKey: str) -> str:
+    """ short hash of an api key, used instead of the key itself in cache keys and file names
+    """
+    return sha256(apiKey.encode()).hexdigest()[:16]
+
+
+class _OrganizationDirectory(_MerakiObject):
+    _directories = {}
+    _directoriesLock = Lock()
+
+    def __init__(self, apiKey: str) -> None:
+        """ init organization directory, the organizations an api key sees indexed by id and name
+
+        Args:
+            apiKey (str): api key of user
+        """
+        super().__init__(apiKey)
+        self.fingerprint = fingerprint(apiKey)
+        self.byId = {}
+        self.byName = {}
+        self.fetched = None
+        self.__lock = Lock()
+
+    def __repr__(self) -> str:
+        return "Organization Directory key: %s, %i organizations" % (self.fingerprint, len(self.byId))
+
+    @classmethod
+    def forKey(cls, apiKey: str):
+        """ gets the directory shared by every object using the api key
+
+        Args:
+            apiKey (str): api key of user
+
+        Returns:
+            _OrganizationDirectory: shared directory
+        """
+        key = fingerprint(apiKey)
+        with cls._directoriesLock:
+            if key not in cls._directories:
+                cls._directories[key] = cls(apiKey)
+            return cls._directories[key]
+
+    def __cacheFile(self) -> str:
+        if _settings['cacheDirectory'] == None: return None
+        return os.path.join(_settings['cacheDirectory'], 'organizations-%s.json' % self.fingerprint)
+
+    def __index(self, organizations: list[dict], fetched: float) -> None:
+        self.byId = {org['id']: org for org in organizations}
+        self.byName = {org['name']: org for org in organizations}
+        self.fetched = fetched
+
+    def __readCache(self) -> bool:
+        path = self.__cacheFile()
+        if path == None or not os.path.exists(path): return False
+        try:
+            with open(path) as file:
+                cache = json.load(file)
+        except (OSError, ValueError):
+            return False
+
+        if time() - cache['fetched'] > _settings['ttl']: return False
+        self.__index(cache['organizations'], cache['fetched'])
+        return True
+
+    def __writeCache(self, organizations: list[dict]) -> None:
+        path = self.__cacheFile()
+        if path == None: return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as file:
+                json.dump({'fetched': self.fetched, 'organizations': organizations}, file)
+        except OSError as err:
+            print('Unable to write organization cache:', err)
+
+    def load(self, force: bool = False) -> None:
+        """ lists the organizations if they are older than the ttl (from disk first when a cache directory is set)
+
+        Args:
+            force (bool, optional): list them even if they are fresh. Defaults to False.
+        """
+        if not force and self.fetched != None and time() - self.fetched <= _settings['ttl']: return
+
+        with self.__lock:
+            if not force and self.fetched != None and time() - self.fetched <= _settings['ttl']: return
+            if not force and self.__readCache(): return
+
+            statusCode, response = self.apiCall('organizations')
+            if statusCode != 200: return
+            self.__index(response, time())
+            self.__writeCache(response)
+
+    def get(self, id: str = None, name: str = None) -> dict:
+        """ gets an organization from id or name, one not in the directory lists the organizations again 
+        (at most every 30 seconds)
+
+        Args:
+            id (str, optional): id of organization. Defaults to None.
+            name (str, optional): name of organization. Defaults to None.
+
+        Returns:
+            dict: organization or None
+        """
+        self.load()
+        org = self.byId.get(id) if id != None else self.byName.get(name)
+        if org == None and time() - (self.fetched or 0) > 30:
+            # it may be newer than the directory, but do not list again for every unknown name
+            self.load(force=True)
+            org = self.byId.get(id) if id != None else self.byName.get(name)
+        return org
+
+    def getId(self, name: str) -> str:
+        """ gets organization id from name
+
+        Args:
+            name (str): name of organization
+
+        Returns:
+            str: id or None
+        """
+        org = self.get(name=name)
+        if org == None: return None
+        return org['id']
+
+    def organizations(self) -> list[dict]:
+        """ gets every organization the api key sees
+
+        Returns:
+            list[dict]: organizations
+        """
+        self.load()
+        return list(self.byId.values())
@@ -1,2 +1,5 @@
 from .policyObject import _PolicyObject
-from .policyObjectGroup import _PolicyObjectGroup
\ No newline at end of file
+from .policyObjectGroup import _PolicyObjectGroup
+from .templateCatalog import _TemplateCatalog
+from .networkCatalog import _NetworkCatalog
+from .policyObjectIndex import _PolicyObjectIndex
\ No newline at end of file
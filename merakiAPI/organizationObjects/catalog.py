@@ -0,0 +1,167 @@
+from threading import Lock
+from time import time
+from ..merakiObject import _MerakiObject
+from ..organizationDirectory import fingerprint
+from ..refresh import refreshItems, RefreshResult
+
+class _Catalog(_MerakiObject):
+    """ items of an organization listing endpoint indexed by id and name, downloaded once and shared until invalidated """
+    _endpoint = None # endpoint of the listing, %s is the organization id
+    _perPage = None # page size if the listing is paginated
+    _collection = None # name of the items ex: 'networks'
+    _catalogs = {}
+    _catalogsLock = Lock()
+    
+    def __init__(self, apiKey: str, organizationId: str) -> None:
+        """ init catalog
+
+        Args:
+            apiKey (str): api key of user
+            organizationId (str): organization id of items
+        """
+        super().__init__(apiKey)
+        self.organizationId = organizationId
+        self.byId = {}
+        self.byName = {}
+        self.loaded = False
+        self.fetched = None # time of the last download
+        self.__lock = Lock()
+    
+    def __repr__(self) -> str:
+        return "%s org: %s, %s items" % (type(self).__name__.strip('_'), self.organizationId, len(self.byId) if self.loaded else 'not loaded')
+    
+    @classmethod
+    def forOrganization(cls, apiKey: str, organizationId: str):
+        """ gets the catalog shared by every object of the organization using the same api key,
+        keys never share items (or credentials and rate budget) with each other
+
+        Args:
+            apiKey (str): api key of user
+            organizationId (str): organization id of items
+
+        Returns:
+            _Catalog: shared catalog
+        """
+        with cls._catalogsLock:
+            key = (cls.__name__, fingerprint(apiKey), organizationId)
+            if key not in cls._catalogs:
+                cls._catalogs[key] = cls(apiKey, organizationId)
+            return cls._catalogs[key]
+    
+    def __download(self) -> list:
+        endpoint = self._endpoint % self.organizationId
+        if self._perPage == None:
+            statusCode, response = self.apiCall(endpoint)
+            return response if statusCode == 200 else None
+        
+        items = []
+        for statusCode, page in self._iterPages(endpoint, {'perPage': self._perPage}):
+            if statusCode != 200: return None
+            items += page
+        return items
+    
+    def load(self) -> None:
+        """ downloads the items if they are not loaded yet
+        """
+        if self.loaded: return
+        
+        with self.__lock:
+            if self.loaded: return
+            items = self.__download()
+            if items == None: return
+            
+            self.byId = {item['id']: item for item in items}
+            self.byName = {item['name']: item for item in items}
+            self.loaded, self.fetched = True, time()
+    
+    def invalidate(self) -> None:
+        """ drops the items, they are downloaded again on next use
+        """
+        with self.__lock:
+            self.loaded = False
+    
+    def refresh(self) -> RefreshResult:
+        """ downloads the items again and swaps in the updated items, readers keep the dicts they already got
+
+        Returns:
+            RefreshResult: ids added, changed and removed, None if they could not be downloaded
+        """
+        items = self.__download()
+        if items == None: return None
+        
+        with self.__lock:
+            byId = dict(self.byId)
+            result = refreshItems(self._collection, byId, items)
+            self.byId, self.byName = byId, {item['name']: item for item in byId.values()}
+            self.loaded, self.fetched = True, time()
+        return result
+    
+    def add(self, item: dict) -> None:
+        """ adds a new item (ex: just created) without downloading the catalog again
+
+        Args:
+            item (dict): item from the api
+        """
+        with self.__lock:
+            if not self.loaded: return
+            self.byId = self.byId | {item['id']: item}
+            self.byName = self.byName | {item['name']: item}
+    
+    def get(self, id: str = None, name: str = None) -> dict:
+        """ gets an item from id or name, a name or id not in the catalog downloads the items again
+        (at most every 30 seconds)
+
+        Args:
+            id (str, optional): id of item. Defaults to None.
+            name (str, optional): name of item. Defaults to None.
+
+        Returns:
+            dict: item or None
+        """
+        self.load()
+        item = self.byId.get(id) if id != None else self.byName.get(name)
+        if item == None and self.loaded and self.__claimReload():
+            # it may be newer than the catalog, but do not download again for every unknown name
+            self.refresh()
+            item = self.byId.get(id) if id != None else self.byName.get(name)
+        return item
+    
+    def __claimReload(self) -> bool:
+        # only one of the threads missing at once downloads again
+        with self.__lock:
+            if time() - (self.fetched or 0) <= 30: return False
+            self.fetched = time()
+            return True
+    
+    def getId(self, name: str) -> str:
+        """ gets id from name
+
+        Args:
+            name (str): name of item
+
+        Returns:
+            str: id or None
+        """
+        item = self.get(name=name)
+        if item == None: return None
+        return item['id']
+    
+    def names(self) -> list[str]:
+        """ gets the names of every item
+
+        Returns:
+            list[str]: names, None if they could not be downloaded
+        """
+        self.load()
+        if not self.loaded: return None
+        return list(self.byName.keys())
+    
+    def items(self) -> list[dict]:
+        """ gets every item
+
+        Returns:
+            list[dict]: items, None if they could not be downloaded
+        """
+        self.load()
+        if not self.loaded: return None
+        return list(self.byId.values())
@@ -0,0 +1,7 @@
+from .catalog import _Catalog
+
+class _NetworkCatalog(_Catalog):
+    """ networks of an organization indexed by id and name """
+    _endpoint = 'organizations/%s/networks'
+    _collection = 'networks'
+    _perPage = 1000
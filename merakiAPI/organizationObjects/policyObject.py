@@ -1,4 +1,5 @@
 from ..merakiObject import _MerakiObject
+from ..refresh import contentHash
 import json
 
 class _PolicyObject(_MerakiObject):
@@ -18,6 +19,17 @@ class _PolicyObject(_MerakiObject):
     def __repr__(self) -> str:
         return "Policy Object Name: %s, type: %s, address: %s" % (self.name, self.type, self.address)
     
+    def contentHash(self) -> str:
+        """ hash of the settings of the policy object, to tell if it changed
+        """
+        return contentHash([self.name, self.category, self.type, self.address, self.groupIds])
+    
+    def _update(self, other) -> None:
+        """ takes the settings of another copy of the policy object, keeping this object,
+        in one dict update so other threads never see half of the change
+        """
+        vars(self).update(name=other.name, category=other.category, type=other.type, address=other.address, groupIds=other.groupIds)
+    
     def get(self, poId):
         endpoint = 'organizations/%s/policyObjects/%s' % (self.organizationId, poId)
         statusCode, response = self.apiCall(endpoint)
@@ -50,6 +62,22 @@ class _PolicyObject(_MerakiObject):
         self.address = addr
         self.groupIds = groupIds
         
+    def addToGroups(self, groupIds: list[str]) -> None:
+        """ adds the policy object to groups it is not in yet
+
+        Args:
+            groupIds (list[str]): ids of policy object groups
+        """
+        groupIds = [groupId for groupId in groupIds if groupId not in (self.groupIds or [])]
+        if len(groupIds) == 0: return
+        
+        endpoint = 'organizations/%s/policyObjects/%s' % (self.organizationId, self.id)
+        statusCode, response = self.apiCall(endpoint, {'groupIds': (self.groupIds or []) + groupIds}, 'PUT')
+        if statusCode != 200:
+            print('unable to add policy object to groups', response)
+            return
+        self.groupIds = response['groupIds']
+        
     def delete(self):
         endpoint = 'organizations/%s/policyObjects/%s' % (self.organizationId, self.id)
         response = self._delete(endpoint)
@@ -1,4 +1,5 @@
 from ..merakiObject import _MerakiObject
+from ..refresh import contentHash
 import json
 
 class _PolicyObjectGroup(_MerakiObject):
@@ -13,6 +14,17 @@ class _PolicyObjectGroup(_MerakiObject):
     def __repr__(self) -> str:
         return "Policy object group Name: %s, id: %s" % (self.name, self.id)
     
+    def contentHash(self) -> str:
+        """ hash of the settings of the group, to tell if it changed
+        """
+        return contentHash([self.name, self.objectIds])
+    
+    def _update(self, other) -> None:
+        """ takes the settings of another copy of the group, keeping this object,
+        in one dict update so other threads never see half of the change
+        """
+        vars(self).update(name=other.name, objectIds=other.objectIds)
+    
     def get(self, policyObjectGroupId: str) -> None:
         endpoint = 'organizations/%s/policyObjects/groups/%s' % (self.organizationId, policyObjectGroupId)
         statusCode, response = self.apiCall(endpoint)
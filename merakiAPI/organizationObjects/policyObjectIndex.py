@@ -0,0 +1,215 @@
+from bisect import bisect_left, bisect_right, insort
+from ipaddress import ip_network
+from threading import RLock
+
+def normalizeFqdn(fqdn: str) -> str:
+    """ fqdn as compared by the index, lower case without spaces or the trailing dot
+    """
+    return fqdn.strip().lower().rstrip('.')
+
+def _prefix(cidr: str) -> tuple[int, int, int]:
+    """ first address, prefix length and max prefix length of a cidr or ip
+    """
+    network = ip_network(cidr.strip(), strict=False)
+    return int(network.network_address), network.prefixlen, network.max_prefixlen
+
+def addressKey(type: str, address: str) -> tuple:
+    """ (type, normalized address), the same for every way of writing one address ex: 10.0.0.5/24 and 10.0.0.0/24
+    """
+    if type == 'fqdn': return type, normalizeFqdn(address)
+    try:
+        return type, _prefix(address)
+    except ValueError:
+        return type, address.strip()
+
+
+class _PolicyObjectIndex():
+    """ policy objects by prefix (cidr objects) and by normalized fqdn (fqdn objects),
+    changes and queries hold a lock so one index can be shared by threads """
+    def __init__(self, policyObjects: list = None, policyObjectGroups: list = None) -> None:
+        """ init policy object index
+
+        Args:
+            policyObjects (list, optional): policy object objects to index. Defaults to None.
+            policyObjectGroups (list, optional): policy object group objects, to answer group queries. Defaults to None.
+        """
+        self.prefixes = {} # (max prefix length, prefix length) to {first address: [policy objects]}
+        self.lengths = {} # max prefix length (32 or 128) to prefix lengths in use, sorted
+        self.starts = [] # (max prefix length, first address, prefix length) of every prefix, sorted
+        self.fqdns = {} # normalized fqdn to [policy objects]
+        self.groups = {group.id: group for group in policyObjectGroups or [] if group != None}
+        self.size = 0
+        self.__lock = RLock()
+
+        for policyObject in policyObjects or []:
+            self.add(policyObject)
+
+    def __repr__(self) -> str:
+        return "Policy Object Index: %i objects, %i fqdns" % (self.size, len(self.fqdns))
+
+    def __len__(self) -> int:
+        return self.size
+
+    # ------------- Changes ------------- #
+    def add(self, policyObject) -> None:
+        """ indexes a policy object (cidr or fqdn, other types are skipped)
+        """
+        with self.__lock:
+            if policyObject == None or policyObject.address == None: return
+            if policyObject.type == 'fqdn':
+                self.fqdns.setdefault(normalizeFqdn(policyObject.address), []).append(policyObject)
+            elif policyObject.type == 'cidr':
+                start, length, maxLength = _prefix(policyObject.address)
+                table = self.prefixes.setdefault((maxLength, length), {})
+                if start not in table:
+                    table[start] = []
+                    insort(self.starts, (maxLength, start, length))
+                    lengths = self.lengths.setdefault(maxLength, [])
+                    if length not in lengths: insort(lengths, length)
+                table[start].append(policyObject)
+            else: return
+            self.size += 1
+
+    def remove(self, policyObject) -> None:
+        """ takes a policy object out of the index
+        """
+        with self.__lock:
+            if policyObject == None or policyObject.address == None: return
+            if policyObject.type == 'fqdn':
+                objects = self.fqdns.get(normalizeFqdn(policyObject.address), [])
+                if policyObject not in objects: return
+                objects.remove(policyObject)
+                if len(objects) == 0: del self.fqdns[normalizeFqdn(policyObject.address)]
+            elif policyObject.type == 'cidr':
+                start, length, maxLength = _prefix(policyObject.address)
+                objects = self.prefixes.get((maxLength, length), {}).get(start, [])
+                if policyObject not in objects: return
+                objects.remove(policyObject)
+                if len(objects) == 0:
+                    del self.prefixes[(maxLength, length)][start]
+                    self.starts.remove((maxLength, start, length))
+            else: return
+            self.size -= 1
+
+    def addGroup(self, group) -> None:
+        if group != None: self.groups[group.id] = group
+
+    def removeGroup(self, group) -> None:
+        if group != None: self.groups.pop(group.id, None)
+
+    # ------------- Queries ------------- #
+    def find(self, type: str, address: str) -> list:
+        """ policy objects with the same address, after normalizing ex: find('cidr', '10.0.0.5/24') finds 10.0.0.0/24
+
+        Args:
+            type (str): 'cidr' or 'fqdn'
+            address (str): cidr or fqdn
+
+        Returns:
+            list: policy objects
+        """
+        with self.__lock:
+            if type == 'fqdn': return list(self.fqdns.get(normalizeFqdn(address), []))
+            start, length, maxLength = _prefix(address)
+            return list(self.prefixes.get((maxLength, length), {}).get(start, []))
+
+    def covering(self, address: str) -> list:
+        """ policy objects covering an ip, cidr or fqdn, most specific first,
+        fqdns are covered by the same fqdn and wildcards ex: *.example.com covers www.example.com
+
+        Args:
+            address (str): ip, cidr or fqdn ex: 10.20.30.40
+
+        Returns:
+            list: policy objects
+        """
+        with self.__lock:
+            try:
+                start, length, maxLength = _prefix(address)
+            except ValueError:
+                fqdn = normalizeFqdn(address)
+                labels = fqdn.split('.')
+                covering = list(self.fqdns.get(fqdn, []))
+                for i in range(1, len(labels)):
+                    covering += self.fqdns.get('*.' + '.'.join(labels[i:]), [])
+                return covering
+
+            covering = []
+            for prefixLength in reversed(self.lengths.get(maxLength, [])):
+                if prefixLength > length: continue
+                hostBits = maxLength - prefixLength
+                covering += self.prefixes[(maxLength, prefixLength)].get(start >> hostBits << hostBits, [])
+            return covering
+
+    def longestPrefix(self, address: str):
+        """ most specific cidr policy object covering an ip or cidr
+
+        Args:
+            address (str): ip or cidr ex: 10.20.30.40
+
+        Returns:
+            policy object or None
+        """
+        covering = self.covering(address)
+        return covering[0] if len(covering) > 0 else None
+
+    def coveringGroups(self, address: str) -> list:
+        """ policy object groups holding a policy object covering address, see covering
+
+        Args:
+            address (str): ip, cidr or fqdn
+
+        Returns:
+            list: policy object groups (group ids if the group is not known)
+        """
+        groupIds = []
+        for policyObject in self.covering(address):
+            for groupId in policyObject.groupIds or []:
+                if groupId not in groupIds: groupIds.append(groupId)
+        return [self.groups.get(groupId, groupId) for groupId in groupIds]
+
+    def within(self, cidr: str) -> list:
+        """ cidr policy objects inside cidr (cidr itself included)
+
+        Args:
+            cidr (str): cidr ex: 10.20.0.0/16
+
+        Returns:
+            list: policy objects
+        """
+        with self.__lock:
+            start, length, maxLength = _prefix(cidr)
+            end = start + 2 ** (maxLength - length) - 1
+            first = bisect_left(self.starts, (maxLength, start, length))
+            last = bisect_right(self.starts, (maxLength, end, maxLength))
+            return [policyObject for maxLength, start, length in self.starts[first:last]
+                    for policyObject in self.prefixes[(maxLength, length)][start]]
+
+    def duplicates(self) -> list[list]:
+        """ policy objects with the same address (after normalizing)
+
+        Returns:
+            list[list]: each list holds the objects sharing one address
+        """
+        with self.__lock:
+            duplicates = [list(objects) for objects in self.fqdns.values() if len(objects) > 1]
+            duplicates += [list(objects) for table in self.prefixes.values() for objects in table.values() if len(objects) > 1]
+            return duplicates
+
+    def redundant(self) -> list[tuple]:
+        """ cidr policy objects already covered by a shorter prefix policy object
+
+        Returns:
+            list[tuple]: redundant object and the object covering it
+        """
+        with self.__lock:
+            redundant = []
+            for maxLength, start, length in self.starts:
+                for prefixLength in self.lengths[maxLength]:
+                    if prefixLength >= length: break
+                    hostBits = maxLength - prefixLength
+                    covering = self.prefixes[(maxLength, prefixLength)].get(start >> hostBits << hostBits)
+                    if covering:
+                        redundant += [(policyObject, covering[0]) for policyObject in self.prefixes[(maxLength, length)][start]]
+                        break
+            return redundant
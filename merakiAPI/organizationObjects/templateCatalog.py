@@ -0,0 +1,6 @@
+from .catalog import _Catalog
+
+class _TemplateCatalog(_Catalog):
+    """ config templates of an organization indexed by id and name """
+    _endpoint = 'organizations/%s/configTemplates'
+    _collection = 'templates'
@@ -0,0 +1,188 @@
+import asyncio
+from array import array
+from threading import Event, Lock, Thread
+from typing import Callable
+from .merakiObject import _MerakiObject
+from .fanOut import fanOut
+
+_fields = ['enabled', 'status', 'speed', 'duplex', 'errors', 'poe']
+
+def _portValues(port: dict) -> list:
+    return [
+        port.get('enabled'),
+        port.get('status'),
+        port.get('speed'),
+        port.get('duplex'),
+        tuple(sorted(port.get('errors') or [])),
+        (port.get('poe') or {}).get('isAllocated'),
+    ]
+
+class PortChange():
+    """ a change of one field of a switch port between two polls """
+    def __init__(self, serial: str, portId: str, field: str, old, new) -> None:
+        self.serial = serial
+        self.portId = portId
+        self.field = field
+        self.old = old
+        self.new = new
+
+    def __repr__(self) -> str:
+        return "Port Change %s port %s: %s %s -> %s" % (self.serial, self.portId, self.field, self.old, self.new)
+
+    @property
+    def kind(self) -> str:
+        """ 'up', 'down' for link changes, otherwise the field name
+        """
+        if self.field == 'status':
+            if self.new == 'Connected': return 'up'
+            if self.old == 'Connected': return 'down'
+        return self.field
+
+
+class _PortSnapshot():
+    """ statuses of the ports of one switch, one array per field holding codes of interned values """
+    def __init__(self, portIds: list[str]) -> None:
+        self.portIds = portIds
+        self.index = {portId: i for i, portId in enumerate(portIds)}
+        self.columns = [array('I', [0] * len(portIds)) for _ in _fields]
+
+
+class _PortStatusPoller(_MerakiObject):
+    def __init__(self, apiKey: str, switches: list, organizationId: str = None,
+                 interval: float = 60, maxWorkers: int = 8) -> None:
+        """ init port status poller, each poll diffs the port statuses against the last poll and emits the changes
+
+        Args:
+            apiKey (str): api key of user
+            switches (list): switch objects or serials to watch, switch objects get their portStatuses refreshed
+            organizationId (str, optional): organization of the switches, if set uses the organization statuses by switch endpoint. Defaults to None.
+            interval (float, optional): seconds between polls when running. Defaults to 60.
+            maxWorkers (int, optional): max switches polled at once without organizationId. Defaults to 8.
+        """
+        super().__init__(apiKey)
+        self.organizationId = organizationId
+        self.interval = interval
+        self.maxWorkers = maxWorkers
+        self.switches = {switch if isinstance(switch, str) else switch.serial: switch for switch in switches}
+        self.snapshots = {}
+        self.__callbacks = []
+        self.__values = [None] # code to value, code 0 is None
+        self.__codes = {None: 0}
+        self.__lock = Lock()
+        self.__stop = Event()
+        self.__thread = None
+
+    def __repr__(self) -> str:
+        return "Port Status Poller: %i switches, every %s seconds" % (len(self.switches), self.interval)
+
+    def __code(self, value) -> int:
+        if value not in self.__codes:
+            self.__codes[value] = len(self.__values)
+            self.__values.append(value)
+        return self.__codes[value]
+
+    def onChange(self, callback: Callable) -> None:
+        """ adds a callback called with every PortChange
+
+        Args:
+            callback (Callable): function taking a PortChange
+        """
+        self.__callbacks.append(callback)
+
+    def __getStatuses(self) -> dict:
+        """ statuses of every watched switch, serial to list of port statuses
+        """
+        if self.organizationId != None:
+            endpoint = 'organizations/%s/switch/ports/statuses/bySwitch' % self.organizationId
+            statuses = {}
+            for statusCode, page in self._iterPages(endpoint, {'perPage': 20, 'serials[]': list(self.switches.keys())}):
+                for switch in page:
+                    if switch['serial'] in self.switches: statuses[switch['serial']] = switch['ports']
+            return statuses
+
+        def getStatuses(serial: str) -> list:
+            statusCode, response = self.apiCall('devices/%s/switch/ports/statuses' % serial)
+            if statusCode != 200: raise LookupError('unable to get port statuses of %s' % serial)
+            return response
+
+        return fanOut(list(self.switches.keys()), getStatuses, key=lambda serial: serial, maxWorkers=self.maxWorkers).results
+
+    def __diff(self, serial: str, ports: list[dict]) -> list[PortChange]:
+        portIds = [str(port['portId']) for port in ports]
+        old = self.snapshots.get(serial)
+        if old == None or old.portIds != portIds:
+            new = _PortSnapshot(portIds)
+        else:
+            new = old
+
+        changes = []
+        for i, port in enumerate(ports):
+            for f, value in enumerate(_portValues(port)):
+                code = self.__code(value)
+                if old != None and new is old and old.columns[f][i] != code:
+                    changes.append(PortChange(serial, portIds[i], _fields[f], self.__values[old.columns[f][i]], value))
+                new.columns[f][i] = code
+
+        self.snapshots[serial] = new
+        return changes
+
+    def poll(self) -> list[PortChange]:
+        """ gets the port statuses of every switch and returns the changes since the last poll,
+        the first poll only takes the snapshot
+
+        Returns:
+            list[PortChange]: changes since last poll
+        """
+        statuses = self.__getStatuses()
+
+        changes = []
+        with self.__lock:
+            for serial, ports in statuses.items():
+                changes += self.__diff(serial, ports)
+
+                switch = self.switches[serial]
+                if not isinstance(switch, str): 
+                    switch.portStatuses = {port['portId']: port for port in ports}
+                    byId = {str(port['portId']): port for port in ports}
+                    changed = {change.portId for change in changes if change.serial == serial}
+                    for table in list(getattr(switch, 'portTables', [])):
+                        for portId in changed:
+                            table.updatePort(serial, portId, status=byId[portId])
+
+        for change in changes:
+            for callback in self.__callbacks:
+                callback(change)
+        return changes
+
+    def __run(self) -> None:
+        while not self.__stop.is_set():
+            try:
+                self.poll()
+            except Exception as err:
+                print('Port status poll failed:', err)
+            self.__stop.wait(self.interval)
+
+    def start(self) -> None:
+        """ starts polling every interval in a background thread, changes go to the onChange callbacks
+        """
+        if self.__thread != None and self.__thread.is_alive(): return
+        self.__stop.clear()
+        self.__thread = Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+    def stop(self) -> None:
+        """ stops the background polling
+        """
+        self.__stop.set()
+        if self.__thread != None: self.__thread.join()
+
+    async def events(self):
+        """ polls every interval and yields the changes, for use with async for
+
+        Yields:
+            PortChange: each change
+        """
+        while True:
+            for change in await asyncio.to_thread(self.poll):
+                yield change
+            await asyncio.sleep(self.interval)
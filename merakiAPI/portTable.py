@@ -0,0 +1,182 @@
+from threading import RLock
+
+class PortTable():
+    """ columnar table of switch ports and their statuses, with indexes on serial, vlan, type, status and enabled """
+    portFields = ['name', 'enabled', 'type', 'vlan', 'voiceVlan', 'allowedVlans', 'poeEnabled']
+    statusFields = ['status', 'speed', 'duplex', 'errors', 'warnings', 'clientCount']
+    indexed = ['serial', 'vlan', 'type', 'status', 'enabled']
+
+    def __init__(self, switches: list = None) -> None:
+        """ init port table
+
+        Args:
+            switches (list, optional): switch objects to add, their updatePort keeps the table up to date. Defaults to None.
+        """
+        self.columns = {field: [] for field in ['serial', 'portId'] + self.portFields + self.statusFields}
+        self.indexes = {field: {} for field in self.indexed}
+        self.rows = {} # (serial, portId) to row id
+        self.__lock = RLock()
+
+        for switch in switches or []:
+            self.addSwitch(switch)
+
+    def __repr__(self) -> str:
+        return "Port Table: %i ports, %i switches" % (len(self), len(self.indexes['serial']))
+
+    def __len__(self) -> int:
+        return len(self.columns['serial'])
+
+    def __values(self, serial: str, portId: str, port: dict, status: dict) -> dict:
+        values = {'serial': serial, 'portId': str(portId)}
+        values |= {field: port.get(field) for field in self.portFields}
+        values |= {field: status.get(field) for field in self.statusFields}
+        values['errors'] = tuple(values['errors'] or [])
+        values['warnings'] = tuple(values['warnings'] or [])
+        return values
+
+    def __setRow(self, row: int, values: dict) -> None:
+        for field in self.indexed:
+            old = self.columns[field][row]
+            if old == values[field] and row in self.indexes[field].get(old, ()): continue
+            if row in self.indexes[field].get(old, ()):
+                self.indexes[field][old].discard(row)
+                if len(self.indexes[field][old]) == 0: del self.indexes[field][old]
+            self.indexes[field].setdefault(values[field], set()).add(row)
+
+        for field, value in values.items():
+            self.columns[field][row] = value
+
+    def add(self, serial: str, ports: dict, statuses: dict = None) -> None:
+        """ adds or replaces the ports of a switch
+
+        Args:
+            serial (str): serial of switch
+            ports (dict): port id to port settings, like _Switch.ports
+            statuses (dict, optional): port id to port status, like _Switch.portStatuses. Defaults to None.
+        """
+        with self.__lock:
+            for portId, port in ports.items():
+                self.updatePort(serial, portId, port, (statuses or {}).get(portId))
+
+    def addSwitch(self, switch) -> None:
+        """ adds the ports of a switch object and follows its port updates
+
+        Args:
+            switch (_Switch): switch object
+        """
+        self.add(switch.serial, switch.ports or {}, switch.portStatuses or {})
+        switch.portTables.add(self)
+
+    def removeSwitch(self, switch) -> None:
+        """ stops following the port updates of a switch object, its ports stay in the table
+
+        Args:
+            switch (_Switch): switch object
+        """
+        switch.portTables.discard(self)
+
+    def updatePort(self, serial: str, portId: str, port: dict = None, status: dict = None) -> None:
+        """ updates (or adds) one port, only its row and index entries change
+
+        Args:
+            serial (str): serial of switch
+            portId (str): port id
+            port (dict, optional): new port settings, if None keeps the current ones. Defaults to None.
+            status (dict, optional): new port status, if None keeps the current one. Defaults to None.
+        """
+        key = (serial, str(portId))
+        with self.__lock:
+            if key not in self.rows:
+                self.rows[key] = len(self)
+                for column in self.columns.values(): column.append(None)
+
+            row = self.rows[key]
+            current = self.get(row)
+            values = self.__values(serial, portId,
+                                   port if port != None else {field: current[field] for field in self.portFields},
+                                   status if status != None else {field: current[field] for field in self.statusFields})
+            self.__setRow(row, values)
+
+    # ------------- Queries ------------- #
+    def get(self, row: int) -> dict:
+        """ a row as a dict
+
+        Args:
+            row (int): row id
+
+        Returns:
+            dict: field to value
+        """
+        return {field: column[row] for field, column in self.columns.items()}
+
+    def where(self, predicate=None, **conditions) -> list[int]:
+        """ row ids of the ports matching every condition, indexed fields are looked up in their index,
+        a list value matches any of its values
+
+        Args:
+            predicate (Callable, optional): extra check taking the row dict. Defaults to None.
+
+        Returns:
+            list[int]: matching row ids ex: where(vlan=30, type='access', status='Disconnected')
+        """
+        with self.__lock:
+            rows = None
+            for field, wanted in sorted(conditions.items(), key=lambda item: item[0] not in self.indexed):
+                wanted = wanted if isinstance(wanted, (list, set, tuple)) else [wanted]
+                if field in self.indexed:
+                    matched = set().union(*[self.indexes[field].get(value, set()) for value in wanted])
+                else:
+                    column = self.columns[field]
+                    matched = {row for row in (rows if rows != None else range(len(self))) if column[row] in wanted}
+                rows = matched if rows == None else rows & matched
+                if len(rows) == 0: return []
+
+            rows = sorted(rows) if rows != None else list(range(len(self)))
+            if predicate != None:
+                rows = [row for row in rows if predicate(self.get(row))]
+            return rows
+
+    def query(self, predicate=None, **conditions) -> list[dict]:
+        """ ports matching every condition, see where
+
+        Returns:
+            list[dict]: matching ports
+        """
+        with self.__lock:
+            return [self.get(row) for row in self.where(predicate, **conditions)]
+
+    def count(self, predicate=None, **conditions) -> int:
+        return len(self.where(predicate, **conditions))
+
+    def withErrors(self, match: str = None, **conditions) -> list[dict]:
+        """ ports reporting errors ex: withErrors('CRC', type='trunk')
+
+        Args:
+            match (str, optional): only errors containing this text. Defaults to None.
+
+        Returns:
+            list[dict]: matching ports
+        """
+        errors = self.columns['errors']
+        return [self.get(row) for row in self.where(**conditions)
+                if len(errors[row]) > 0 and (match == None or any(match in error for error in errors[row]))]
+
+    def groupBy(self, field: str, predicate=None, **conditions) -> dict:
+        """ counts the matching ports by the value of field
+
+        Args:
+            field (str): field to group by ex: 'vlan'
+
+        Returns:
+            dict: value to number of ports
+        """
+        with self.__lock:
+            if field in self.indexed and predicate == None and len(conditions) == 0:
+                return {value: len(group) for value, group in self.indexes[field].items()}
+
+            rows = self.where(predicate, **conditions)
+            column = self.columns[field]
+            groups = {}
+            for row in rows:
+                groups[column[row]] = groups.get(column[row], 0) + 1
+            return groups
@@ -2,4 +2,5 @@ from .appliance import _Appliance
 from .camera import _Camera
 from .sensor import _Sensor
 from .switch import _Switch
-from .wireless import _Wireless
\ No newline at end of file
+from .wireless import _Wireless
+from .ipRanges import _IpRangeSet
\ No newline at end of file
@@ -1,12 +1,15 @@
 import json
-from typing import Union
+from threading import Lock
+from typing import Callable, Union
 from ..device import Device
 from ..merakiObject import _MerakiObject
+from .ipRanges import _IpRangeSet
 
 class _Appliance(_MerakiObject):
     def __init__(self, apiKey: str, networkId: str) -> None:
         super().__init__(apiKey)
         self.networkId = networkId
+        self.__vlansLock = Lock() # vlans is copied on write, the lock keeps concurrent changes from losing each other
         self.firewall = _L3Firewall(apiKey, self.networkId)
         self.vlansEnabled = self.getVLANsEnabled()
 
@@ -22,6 +25,20 @@ class _Appliance(_MerakiObject):
         
         return [_VLAN(self._apiKey, self.networkId, vlan['id']) for vlan in response] 
     
+    def refreshVLANs(self) -> None:
+        """ gets the VLAN settings and VLANs again, keeps the current ones if they could not be loaded
+        """
+        with self.__vlansLock:
+            vlans = getattr(self, 'vlans', None)
+            vlansEnabled = self.getVLANsEnabled()
+            if vlansEnabled == None:
+                self.vlans = vlans
+                return
+            self.vlansEnabled = vlansEnabled
+            if self.vlansEnabled: 
+                vlans = self.__getVLANs()
+                if vlans != None: self.vlans = vlans
+    
     def enableVLANs(self) -> None:
         if self.vlansEnabled: return
         
@@ -74,10 +91,12 @@ class _Appliance(_MerakiObject):
             print('VLAN could not be created')
             return None
         
-        if hasattr(self, 'vlans'):
-            self.vlans.append(_VLAN(self._apiKey, self.networkId, response['id']))
-        else:
-            self.vlans = _VLAN(self._apiKey, self.networkId, response['id'])
+        vlan = _VLAN(self._apiKey, self.networkId, response['id'])
+        with self.__vlansLock:
+            if hasattr(self, 'vlans'):
+                self.vlans = (self.vlans or []) + [vlan]
+            else:
+                self.vlans = vlan
         
         
 class _VLAN(_MerakiObject):
@@ -90,6 +109,7 @@ class _VLAN(_MerakiObject):
         self.subnet = vlan['subnet']
         self.applianceIp = vlan['applianceIp']
         self.additionalOptions = {k : v for k, v in vlan.items() if k not in ['name', 'subnet', 'applianceIp']}
+        self.__rangesLock = Lock() # reserved ranges are read, changed and sent back as one step
     
     def __repr__(self) -> str:
         return "Id: %i, Name: %s, Subnet: %s, Appliance IP: %s" % (self.id, self.name, self.subnet, self.applianceIp)
@@ -148,31 +168,88 @@ class _VLAN(_MerakiObject):
             self.subnet = newSubnet
     
     def getReservedIpRanges(self) -> list[dict]: 
-        print(self.additionalOptions['reservedIpRanges'])
-        return self.additionalOptions['reservedIpRanges']
+        return self.additionalOptions.get('reservedIpRanges', [])
     
-    def reserveIpRange(self, start: str, end: str, comment: str = "comment", keepOld=True) -> None:
-        endpoint = 'networks/%s/appliance/vlans/%s' % (self.networkId, self.id)
-        if 'reservedIpRanges' in self.additionalOptions.keys():
-            _oldReservedIpRanges = self.additionalOptions['reservedIpRanges']
-        
-        newRange = {
-            "start": start,
-            "end": end,
-            "comment": comment
-        }
-        
-        payload = {
-            'reservedIpRanges': _oldReservedIpRanges + [newRange]
-        }        
+    def reservedIpRanges(self) -> _IpRangeSet:
+        """ reserved ip ranges as a range set checked against the subnet, change it and give it to setReservedIpRanges
 
-        statusCode, response = self.apiCall(endpoint, payload, 'PUT')
-        print(statusCode, response)
+        Returns:
+            _IpRangeSet: copy of the reserved ranges
+        """
+        return _IpRangeSet(self.subnet, self.getReservedIpRanges())
+    
+    def setReservedIpRanges(self, ranges: _IpRangeSet) -> tuple:
+        """ replaces the reserved ip ranges in one PUT, nothing is sent if they did not change
+
+        Args:
+            ranges (_IpRangeSet): new reserved ranges
+
+        Returns:
+            tuple: status code and response (200 and the ranges if unchanged)
+        """
+        reservedIpRanges = ranges.toList()
+        if reservedIpRanges == self.reservedIpRanges().toList(): return 200, reservedIpRanges
+        
+        endpoint = 'networks/%s/appliance/vlans/%s' % (self.networkId, self.id)
+        statusCode, response = self.apiCall(endpoint, {'reservedIpRanges': reservedIpRanges}, 'PUT')
         if statusCode != 200:
-            self.reservedIpRanges = _oldReservedIpRanges
-            print('unable to reserve range\n' + response)
-            
+            print('unable to reserve ranges', response)
+            return statusCode, response
+        
         self.additionalOptions['reservedIpRanges'] = response['reservedIpRanges']
+        return statusCode, response['reservedIpRanges']
+    
+    def updateReservedIpRanges(self, update: Callable) -> tuple:
+        """ changes the reserved ip ranges in one PUT, read, changed and sent back under the VLAN's lock
+        so concurrent changes of the same VLAN are not lost
+
+        Args:
+            update (Callable): function taking the _IpRangeSet of the reserved ranges, changes it in place
+
+        Returns:
+            tuple: status code and response
+        """
+        with self.__rangesLock:
+            reserved = self.reservedIpRanges()
+            update(reserved)
+            return self.setReservedIpRanges(reserved)
+    
+    def reserveIpRanges(self, ranges: list[dict], keepOld: bool = True) -> tuple:
+        """ reserves many ip ranges in one PUT, merged with the ranges they overlap
+
+        Args:
+            ranges (list[dict]): ranges [{'start', 'end', 'comment'}]
+            keepOld (bool, optional): keep the ranges already reserved. Defaults to True.
+
+        Raises:
+            ValueError: a range is backwards or not in the subnet of the VLAN
+
+        Returns:
+            tuple: status code and response
+        """
+        with self.__rangesLock:
+            reserved = self.reservedIpRanges() if keepOld else _IpRangeSet(self.subnet)
+            for r in ranges:
+                reserved.add(r['start'], r['end'], r.get('comment', 'comment'))
+            return self.setReservedIpRanges(reserved)
+    
+    def reserveIpRange(self, start: str, end: str, comment: str = "comment", keepOld=True) -> tuple:
+        return self.reserveIpRanges([{'start': start, 'end': end, 'comment': comment}], keepOld)
+    
+    def releaseIpRanges(self, ranges: list[dict]) -> tuple:
+        """ takes ip ranges out of the reserved ranges in one PUT, splitting the ranges they cut
+
+        Args:
+            ranges (list[dict]): ranges [{'start', 'end'}]
+
+        Returns:
+            tuple: status code and response
+        """
+        with self.__rangesLock:
+            reserved = self.reservedIpRanges()
+            for r in ranges:
+                reserved.remove(r['start'], r['end'])
+            return self.setReservedIpRanges(reserved)
 
     def changeOctetAndRanges(self, octetToChange: int, newValue: int) -> None:
         applianceIp = self.applianceIp.split('.')
@@ -183,7 +260,7 @@ class _VLAN(_MerakiObject):
         subnet[octetToChange-1] = str(newValue)
         newSubnet = '.'.join(subnet)
         
-        oldRanges = self.additionalOptions['reservedIpRanges']
+        oldRanges = self.additionalOptions.get('reservedIpRanges', [])
         newRanges = []
         for range in oldRanges:
             newStart = range['start'].split('.')
@@ -213,6 +290,7 @@ class _L3Firewall(_MerakiObject):
         super().__init__(apiKey)
         self.networkId = networkId
         self.rules = self.__get()
+        self.__rulesLock = Lock() # rules are read, changed and sent back as one step
     
     def __repr__(self) -> str:
         return str(self.rules)
@@ -227,6 +305,12 @@ class _L3Firewall(_MerakiObject):
 
         return response['rules']
     
+    def refresh(self) -> None:
+        """ gets the firewall rules again, keeps the current ones if they could not be loaded
+        """
+        rules = self.__get()
+        if rules != None: self.rules = rules
+    
     def addl3FirewallRule(self, policy: str = 'deny', protocol: str = 'any',
                             srcPort: Union[int, str] = 'any', srcCidr: list[str] = 'any',
                             destPort: Union[int, str] = 'any', destCidr: list[str] = 'any',
@@ -256,7 +340,9 @@ class _L3Firewall(_MerakiObject):
             "syslogEnabled": syslog
         }
         
-        payload = {'rules': self.rules + [newRule]}
-        statusCode, response = self.apiCall(endpoint, payload, 'PUT')
-        
-        self.rules = self.__get()
\ No newline at end of file
+        with self.__rulesLock:
+            payload = {'rules': (self.rules or []) + [newRule]}
+            statusCode, response = self.apiCall(endpoint, payload, 'PUT')
+            
+            if statusCode == 200: self.rules = response['rules']
+            else: self.refresh()
\ No newline at end of file
@@ -10,7 +10,6 @@ class _Camera(Device):
         if statusCode != 200: return
         
         self.url = response['url']
-        print(self.url)
         return response['url']
     
     def getAnalyticsOverview(self) -> list[dict]:
@@ -0,0 +1,134 @@
+from bisect import bisect_left, bisect_right
+from ipaddress import ip_address, ip_network
+
+class _IpRangeSet():
+    """ sorted set of disjoint ip ranges kept as integers, overlapping ranges are merged, touching ones are kept apart """
+    def __init__(self, subnet: str = None, ranges: list[dict] = None) -> None:
+        """ init ip range set
+
+        Args:
+            subnet (str, optional): subnet every range must be in ex: 10.10.10.0/24. Defaults to None.
+            ranges (list[dict], optional): ranges like meraki reservedIpRanges [{'start', 'end', 'comment'}], 
+                not checked against the subnet. Defaults to None.
+        """
+        self.subnet = None
+        self.starts = []
+        self.ends = []
+        self.comments = []
+
+        for r in ranges or []:
+            self.add(r['start'], r['end'], r.get('comment', ''))
+        self.subnet = ip_network(subnet, strict=False) if subnet != None else None
+
+    def __repr__(self) -> str:
+        return "Ip Range Set %s: %s" % (self.subnet, ', '.join('%s-%s' % (ip_address(s), ip_address(e)) for s, e in zip(self.starts, self.ends)))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self):
+        return iter(self.toList())
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, _IpRangeSet) and \
+            (self.starts, self.ends, self.comments) == (other.starts, other.ends, other.comments)
+
+    @property
+    def size(self) -> int:
+        """ number of addresses in the ranges
+        """
+        return sum(e - s + 1 for s, e in zip(self.starts, self.ends))
+
+    def __bounds(self, start: str, end: str) -> tuple[int, int]:
+        start, end = ip_address(start), ip_address(end)
+        if start > end: raise ValueError('range start %s is after end %s' % (start, end))
+        if self.subnet != None and (start not in self.subnet or end not in self.subnet):
+            raise ValueError('range %s-%s is not in subnet %s' % (start, end, self.subnet))
+        return int(start), int(end)
+
+    def add(self, start: str, end: str, comment: str = '') -> None:
+        """ adds a range, merged with the ranges it overlaps (their comments are joined), other ranges are left as they are
+
+        Args:
+            start (str): first ip of range ex: 10.10.10.20
+            end (str): last ip of range ex: 10.10.10.40
+            comment (str, optional): comment of range. Defaults to ''.
+
+        Raises:
+            ValueError: range is backwards or not in the subnet
+        """
+        start, end = self.__bounds(start, end)
+        i = bisect_left(self.ends, start) # first range ending at or after start
+        j = bisect_right(self.starts, end) # ranges starting at or before end
+        if i < j:
+            start, end = min(start, self.starts[i]), max(end, self.ends[j - 1])
+            comments = []
+            for c in self.comments[i:j] + [comment]:
+                if c and c not in comments: comments.append(c)
+            comment = ', '.join(comments)
+
+        self.starts[i:j] = [start]
+        self.ends[i:j] = [end]
+        self.comments[i:j] = [comment]
+
+    def remove(self, start: str, end: str) -> None:
+        """ takes a range out of the set, splitting the ranges it cuts
+
+        Args:
+            start (str): first ip to take out
+            end (str): last ip to take out
+        """
+        start, end = self.__bounds(start, end)
+        i = bisect_left(self.ends, start)
+        j = bisect_right(self.starts, end)
+        if i >= j: return
+
+        starts, ends, comments = [], [], []
+        if self.starts[i] < start:
+            starts.append(self.starts[i]); ends.append(start - 1); comments.append(self.comments[i])
+        if self.ends[j - 1] > end:
+            starts.append(end + 1); ends.append(self.ends[j - 1]); comments.append(self.comments[j - 1])
+
+        self.starts[i:j] = starts
+        self.ends[i:j] = ends
+        self.comments[i:j] = comments
+
+    def contains(self, ip: str) -> bool:
+        """ if ip is in a range
+        """
+        ip = int(ip_address(ip))
+        i = bisect_right(self.starts, ip) - 1
+        return i >= 0 and ip <= self.ends[i]
+
+    def overlaps(self, start: str, end: str) -> bool:
+        """ if any ip from start to end is in a range
+        """
+        start, end = int(ip_address(start)), int(ip_address(end))
+        i = bisect_left(self.ends, start)
+        return i < len(self.starts) and self.starts[i] <= end
+
+    def free(self) -> list[tuple[str, str]]:
+        """ host addresses of the subnet not in a range, needs the subnet
+
+        Returns:
+            list[tuple[str, str]]: first and last ip of each gap
+        """
+        if self.subnet == None: raise ValueError('free ranges need the subnet')
+        first, last = int(self.subnet.network_address), int(self.subnet.broadcast_address)
+        if self.subnet.num_addresses > 2: first, last = first + 1, last - 1 # network and broadcast are not hosts
+
+        gaps, current = [], first
+        for s, e in zip(self.starts, self.ends):
+            if s > current: gaps.append((current, min(s - 1, last)))
+            current = max(current, e + 1)
+        if current <= last: gaps.append((current, last))
+        return [(str(ip_address(s)), str(ip_address(e))) for s, e in gaps if s <= e]
+
+    def toList(self) -> list[dict]:
+        """ ranges as meraki reservedIpRanges
+
+        Returns:
+            list[dict]: [{'start', 'end', 'comment'}]
+        """
+        return [{'start': str(ip_address(s)), 'end': str(ip_address(e)), 'comment': c}
+                for s, e, c in zip(self.starts, self.ends, self.comments)]
@@ -1,9 +1,13 @@
+from threading import Lock
+from weakref import WeakSet
 from ..merakiObject import _MerakiObject
 from ..device import Device
 class _Switch(Device):
     def __init__(self, apiKey:str, serial: str, payload: dict = None) -> None:
         super().__init__(apiKey, serial, True, payload=payload)
         self.serial = serial
+        self.portTables = WeakSet() # port tables to keep up to date on port updates, a dropped table stops being followed
+        self.__portsLock = Lock() # ports is copied on write, the lock keeps concurrent port updates from losing each other
         self.ports = self.getPorts()
         self.portStatuses = self.getPortStatuses()
     
@@ -24,6 +28,19 @@ class _Switch(Device):
         
         return  {port['portId']: port for port in response}
     
+    def refreshPorts(self) -> None:
+        """ gets the ports and port statuses again, keeps the current ones if they could not be loaded,
+        the port tables following the switch are updated
+        """
+        ports, portStatuses = self.getPorts(), self.getPortStatuses()
+        with self.__portsLock:
+            if ports != None: self.ports = ports
+        if portStatuses != None: self.portStatuses = portStatuses
+        
+        for table in list(self.portTables):
+            for portId in set(ports or {}) | set(portStatuses or {}):
+                table.updatePort(self.serial, portId, (ports or {}).get(portId), (portStatuses or {}).get(portId))
+    
     def getTrunkPorts(self) -> list[str]: return [str(key) for key, port in self.ports.items() if port['type'] == 'trunk']
     
     def changePortToAccess(self, portId: str) -> None: return self.updatePort(portId, {"type": "access"})
@@ -49,5 +66,9 @@ class _Switch(Device):
         
         if statusCode != 200: return
         
-        self.ports = self.getPorts()
+        # swap in a copy with the updated port, threads reading the old ports dict are not affected
+        with self.__portsLock:
+            self.ports = (self.ports or {}) | {response['portId']: response}
+        for table in list(self.portTables):
+            table.updatePort(self.serial, portId, response)
         return 'Port %s updated' % portId
\ No newline at end of file
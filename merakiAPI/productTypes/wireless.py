@@ -16,6 +16,12 @@ class _Wireless(Device):
         return [_SSID(self._apiKey, self.networkId, ssid) for ssid in response]
             
         
+    def refreshSSIDs(self) -> None:
+        """ gets the SSIDs of the network again, keeps the current ones if they could not be loaded
+        """
+        ssids = self.__getSSIDs()
+        if ssids != None: self.ssids = ssids
+        
     def updateSSIDs(self, payload: dict, name: str = None, number: int = None) -> None:
         if name == None and number == None:
             print('No Name or Number')
@@ -0,0 +1,99 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from math import isinf
+from threading import Lock
+from time import monotonic, sleep
+
+class RateBudget():
+    def __init__(self, rate: float = 10, burst: int = None) -> None:
+        """ init rate budget, a token bucket shared by every call that spends from it
+
+        Args:
+            rate (float, optional): calls per second, meraki allows 10 per organization, float('inf') never waits. Defaults to 10.
+            burst (int, optional): calls allowed at once before the rate applies, if None same as rate. Defaults to None.
+        """
+        self.rate = rate
+        self.unlimited = isinf(rate)
+        self.burst = burst if burst != None else (1 if self.unlimited else max(1, int(rate)))
+        self.__tokens = float(self.burst)
+        self.__last = monotonic()
+        self.__lock = Lock()
+
+    def __repr__(self) -> str:
+        return "Rate Budget: %s calls/s, burst: %i" % (self.rate, self.burst)
+
+    def __refill(self) -> None:
+        now = monotonic()
+        self.__tokens = min(self.burst, self.__tokens + (now - self.__last) * self.rate)
+        self.__last = now
+
+    def available(self) -> float:
+        """ calls that can be made right now without waiting
+        """
+        if self.unlimited: return float('inf')
+        with self.__lock:
+            self.__refill()
+            return self.__tokens
+
+    def acquire(self) -> float:
+        """ waits until a call can be made and spends it
+
+        Returns:
+            float: seconds spent waiting
+        """
+        if self.unlimited: return 0.0
+        waited = 0.0
+        while True:
+            with self.__lock:
+                self.__refill()
+                if self.__tokens >= 1:
+                    self.__tokens -= 1
+                    return waited
+                wait = (1 - self.__tokens) / self.rate
+            sleep(wait)
+            waited += wait
+
+_budgets = {}
+_budgetsLock = Lock()
+_budgetOverride = ContextVar('budgetOverride', default=None)
+
+def getRateBudget(apiKey: str, rate: float = 10) -> RateBudget:
+    """ gets the rate budget shared by every object using the api key
+
+    Args:
+        apiKey (str): api key of user
+        rate (float, optional): calls per second if the budget does not exist yet. Defaults to 10.
+
+    Returns:
+        RateBudget: shared rate budget
+    """
+    with _budgetsLock:
+        if apiKey not in _budgets:
+            _budgets[apiKey] = RateBudget(rate)
+        return _budgets[apiKey]
+
+def currentRateBudget(apiKey: str) -> RateBudget:
+    """ rate budget calls should spend from, the one set by useRateBudget or else the shared one of the api key
+
+    Args:
+        apiKey (str): api key of user
+
+    Returns:
+        RateBudget: rate budget
+    """
+    override = _budgetOverride.get()
+    if override != None: return override
+    return getRateBudget(apiKey)
+
+@contextmanager
+def useRateBudget(budget: RateBudget):
+    """ spend every call made inside the with block (and fan outs started from it) from budget
+
+    Args:
+        budget (RateBudget): rate budget to use
+    """
+    token = _budgetOverride.set(budget)
+    try:
+        yield budget
+    finally:
+        _budgetOverride.reset(token)
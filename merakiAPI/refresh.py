@@ -0,0 +1,92 @@
+import json
+from hashlib import sha1
+
+def contentHash(content) -> str:
+    """ hash of json-like content, the same for equal content whatever the key order
+    """
+    return sha1(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class RefreshResult():
+    """ ids added, changed and removed by a refresh of one collection, and ids that could not be refreshed with their error """
+    def __init__(self, collection: str) -> None:
+        self.collection = collection
+        self.added = set()
+        self.changed = set()
+        self.removed = set()
+        self.errors = {}
+
+    def __repr__(self) -> str:
+        return "Refresh %s: %i added, %i changed, %i removed, %i errors" % (self.collection, len(self.added), len(self.changed), len(self.removed), len(self.errors))
+
+    @property
+    def isEmpty(self) -> bool:
+        """ if nothing was added, changed or removed
+        """
+        return len(self.added) + len(self.changed) + len(self.removed) == 0
+
+
+def refreshObjects(collection: str, objects: list, fresh: list, onAdd=None, onRemove=None) -> RefreshResult:
+    """ diffs fresh copies against objects by id and content hash and updates objects in place,
+    changed objects keep their identity (see _update), the list itself is changed in place
+
+    Args:
+        collection (str): name of the collection
+        objects (list): objects held, with id, contentHash() and _update(other)
+        fresh (list): objects just built from the api
+        onAdd (Callable, optional): called with each added object, and each changed object after its update. Defaults to None.
+        onRemove (Callable, optional): called with each removed object, and each changed object before its update. Defaults to None.
+
+    Returns:
+        RefreshResult: ids added, changed and removed
+    """
+    result = RefreshResult(collection)
+    current = {obj.id: obj for obj in objects}
+    freshIds = set()
+
+    for copy in fresh:
+        freshIds.add(copy.id)
+        obj = current.get(copy.id)
+        if obj == None:
+            objects.append(copy)
+            result.added.add(copy.id)
+            if onAdd != None: onAdd(copy)
+        elif obj.contentHash() != copy.contentHash():
+            if onRemove != None: onRemove(obj)
+            obj._update(copy)
+            if onAdd != None: onAdd(obj)
+            result.changed.add(copy.id)
+
+    removed = [obj for obj in objects if obj.id not in freshIds]
+    if len(removed) > 0:
+        objects[:] = [obj for obj in objects if obj.id in freshIds]
+        for obj in removed:
+            result.removed.add(obj.id)
+            if onRemove != None: onRemove(obj)
+    return result
+
+
+def refreshItems(collection: str, items: dict, fresh: list[dict]) -> RefreshResult:
+    """ diffs fresh api items against items by id and content hash, changed items are replaced
+
+    Args:
+        collection (str): name of the collection
+        items (dict): id to item held, changed in place
+        fresh (list[dict]): items just downloaded
+
+    Returns:
+        RefreshResult: ids added, changed and removed
+    """
+    result = RefreshResult(collection)
+    freshIds = set()
+    for item in fresh:
+        freshIds.add(item['id'])
+        if item['id'] not in items: result.added.add(item['id'])
+        elif contentHash(items[item['id']]) != contentHash(item): result.changed.add(item['id'])
+        else: continue
+        items[item['id']] = item
+
+    for id in [id for id in items if id not in freshIds]:
+        del items[id]
+        result.removed.add(id)
+    return result
@@ -0,0 +1,99 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from random import uniform
+from threading import Lock
+
+class RetryBudget():
+    def __init__(self, retries: int = 100) -> None:
+        """ init retry budget, the total retries a job may spend across all of its calls
+
+        Args:
+            retries (int, optional): retries allowed. Defaults to 100.
+        """
+        self.retries = retries
+        self.spent = 0
+        self.__lock = Lock()
+
+    def __repr__(self) -> str:
+        return "Retry Budget: %i of %i spent" % (self.spent, self.retries)
+
+    def spend(self) -> bool:
+        """ spends one retry
+
+        Returns:
+            bool: False if the budget is used up
+        """
+        with self.__lock:
+            if self.spent >= self.retries: return False
+            self.spent += 1
+            return True
+
+
+class RetryPolicy():
+    def __init__(self, retries: int = 3, backoff: float = 0.5, maxBackoff: float = 30,
+                 jitter: bool = True, retryStatusCodes: list[int] = [429, 500, 502, 503, 504]) -> None:
+        """ init retry policy
+
+        Args:
+            retries (int, optional): retries of a single call. Defaults to 3.
+            backoff (float, optional): seconds before the first retry, doubled every retry. Defaults to 0.5.
+            maxBackoff (float, optional): max seconds between retries. Defaults to 30.
+            jitter (bool, optional): wait a random time up to the backoff (full jitter). Defaults to True.
+            retryStatusCodes (list[int], optional): status codes worth retrying. Defaults to [429, 500, 502, 503, 504].
+        """
+        self.retries = retries
+        self.backoff = backoff
+        self.maxBackoff = maxBackoff
+        self.jitter = jitter
+        self.retryStatusCodes = list(retryStatusCodes)
+
+    def __repr__(self) -> str:
+        return "Retry Policy: %i retries, backoff: %ss" % (self.retries, self.backoff)
+
+    def delay(self, attempt: int, retryAfter: float = None) -> float:
+        """ seconds to wait before a retry
+
+        Args:
+            attempt (int): retry number starting at 0
+            retryAfter (float, optional): seconds asked by the Retry-After header. Defaults to None.
+
+        Returns:
+            float: seconds to wait
+        """
+        delay = min(self.maxBackoff, self.backoff * 2 ** attempt)
+        if self.jitter: delay = uniform(0, delay)
+        if retryAfter != None: delay = max(delay, retryAfter)
+        return delay
+
+# GET, PUT and DELETE can be sent again without doing the change twice
+idempotentMethods = ['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE']
+
+_defaultPolicy = [RetryPolicy()]
+_retryBudget = ContextVar('retryBudget', default=None)
+
+def getRetryPolicy() -> RetryPolicy:
+    return _defaultPolicy[0]
+
+def setRetryPolicy(policy: RetryPolicy) -> None:
+    """ sets the retry policy of every call, RetryPolicy(retries=0) turns retries off
+
+    Args:
+        policy (RetryPolicy): retry policy
+    """
+    _defaultPolicy[0] = policy
+
+def currentRetryBudget() -> RetryBudget:
+    return _retryBudget.get()
+
+@contextmanager
+def useRetryBudget(budget: RetryBudget):
+    """ every retry made inside the with block (and fan outs started from it) spends from budget
+
+    Args:
+        budget (RetryBudget): retry budget of the job
+    """
+    token = _retryBudget.set(budget)
+    try:
+        yield budget
+    finally:
+        _retryBudget.reset(token)
@@ -0,0 +1,182 @@
+from array import array
+from datetime import datetime, timezone
+from .merakiObject import _MerakiObject
+
+# metric name to the keys holding its value in a reading
+_metricValues = {
+    'apparentPower': ['apparentPower', 'draw'],
+    'battery': ['battery', 'percentage'],
+    'co2': ['co2', 'concentration'],
+    'current': ['current', 'draw'],
+    'door': ['door', 'open'],
+    'frequency': ['frequency', 'level'],
+    'humidity': ['humidity', 'relativePercentage'],
+    'indoorAirQuality': ['indoorAirQuality', 'score'],
+    'noise': ['noise', 'ambient', 'level'],
+    'pm25': ['pm25', 'concentration'],
+    'powerFactor': ['powerFactor', 'percentage'],
+    'realPower': ['realPower', 'draw'],
+    'temperature': ['temperature', 'celsius'],
+    'tvoc': ['tvoc', 'concentration'],
+    'voltage': ['voltage', 'level'],
+    'water': ['water', 'present'],
+}
+
+def _toTimestamp(ts: str) -> float:
+    return datetime.fromisoformat(ts.replace('Z', '+00:00')).timestamp()
+
+def _toIso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+def _readingValue(reading: dict) -> float:
+    value = reading
+    for key in _metricValues.get(reading['metric'], [reading['metric']]):
+        if not isinstance(value, dict) or key not in value: return float('nan')
+        value = value[key]
+
+    if value == None: return float('nan')
+    return float(value)
+
+
+class SensorReadings():
+    """ compact table of sensor readings, serials and metrics are stored once and referenced by index """
+    def __init__(self) -> None:
+        self.timestamps = array('d')
+        self.serialIndex = array('I')
+        self.metricIndex = array('H')
+        self.values = array('d')
+        self.serials = []
+        self.metrics = []
+        self.__serialLookup = {}
+        self.__metricLookup = {}
+
+    def __repr__(self) -> str:
+        return "Sensor Readings: %i readings, %i sensors, %i metrics" % (len(self), len(self.serials), len(self.metrics))
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __index(self, value: str, values: list, lookup: dict) -> int:
+        if value not in lookup:
+            lookup[value] = len(values)
+            values.append(value)
+        return lookup[value]
+
+    def append(self, timestamp: float, serial: str, metric: str, value: float) -> None:
+        """ add a single reading
+
+        Args:
+            timestamp (float): epoch seconds of reading
+            serial (str): serial of sensor
+            metric (str): metric name ex: temperature
+            value (float): value of the reading
+        """
+        self.timestamps.append(timestamp)
+        self.serialIndex.append(self.__index(serial, self.serials, self.__serialLookup))
+        self.metricIndex.append(self.__index(metric, self.metrics, self.__metricLookup))
+        self.values.append(value)
+
+    def extend(self, readings: list[dict]) -> None:
+        """ add a page of readings as returned by the readings history endpoint
+
+        Args:
+            readings (list[dict]): readings from the api
+        """
+        for reading in readings:
+            self.append(_toTimestamp(reading['ts']), reading['serial'], reading['metric'], _readingValue(reading))
+
+    def rows(self) -> list[tuple]:
+        """ readings as (timestamp, serial, metric, value) tuples
+
+        Returns:
+            list[tuple]: one tuple per reading
+        """
+        return [(ts, self.serials[s], self.metrics[m], v)
+                for ts, s, m, v in zip(self.timestamps, self.serialIndex, self.metricIndex, self.values)]
+
+    def latest(self) -> dict:
+        """ latest reading of every sensor and metric
+
+        Returns:
+            dict: (serial, metric) to (timestamp, value)
+        """
+        latest = {}
+        for ts, s, m, v in zip(self.timestamps, self.serialIndex, self.metricIndex, self.values):
+            key = (self.serials[s], self.metrics[m])
+            if key not in latest or latest[key][0] <= ts:
+                latest[key] = (ts, v)
+        return latest
+
+
+class _SensorReadingsPoller(_MerakiObject):
+    def __init__(self, apiKey: str, organizationId: str, metrics: list[str] = None,
+                 serials: list[str] = None, since: float = None) -> None:
+        """ init sensor readings poller, each poll only asks for readings newer than the last one seen
+
+        Args:
+            apiKey (str): api key of user
+            organizationId (str): organization id of the sensors
+            metrics (list[str], optional): metrics to pull, if None all metrics. Defaults to None.
+            serials (list[str], optional): sensors to pull, if None all sensors. Defaults to None.
+            since (float, optional): epoch seconds to start from, if None the first poll looks back one hour. Defaults to None.
+        """
+        super().__init__(apiKey)
+        self.organizationId = organizationId
+        self.metrics = metrics
+        self.serials = serials
+        self.since = since
+        self.__seen = set() # readings at the since timestamp, the api's t0 is inclusive
+
+    def __repr__(self) -> str:
+        return "Sensor Readings Poller org: %s, since: %s" % (self.organizationId, self.since)
+
+    def stream(self, perPage: int = 1000):
+        """ pulls the readings since the last poll one page at a time
+
+        Args:
+            perPage (int, optional): readings per page (3 - 1000). Defaults to 1000.
+
+        Yields:
+            SensorReadings: readings of each page
+        """
+        endpoint = 'organizations/%s/sensor/readings/history' % self.organizationId
+        params = {'perPage': perPage}
+        if self.since == None: params['timespan'] = 3600
+        else: params['t0'] = _toIso(self.since)
+        if self.metrics != None: params['metrics[]'] = self.metrics
+        if self.serials != None: params['serials[]'] = self.serials
+
+        # the cursor only moves once every page was read, a failed page is asked for again on the next poll
+        since, seen, polled = self.since, set(self.__seen), set()
+        for statusCode, page in self._iterPages(endpoint, params):
+            if statusCode != 200: return
+            readings = SensorReadings()
+            for reading in page:
+                ts = _toTimestamp(reading['ts'])
+                key = (ts, reading['serial'], reading['metric'])
+                if key in polled or key in self.__seen: continue # read earlier in this poll, or the last one at the cursor
+                polled.add(key)
+
+                if since == None or ts > since:
+                    since = ts
+                    seen = set()
+                if ts == since: seen.add(key)
+
+                readings.append(ts, reading['serial'], reading['metric'], _readingValue(reading))
+            yield readings
+        self.since, self.__seen = since, seen
+
+    def poll(self, perPage: int = 1000) -> SensorReadings:
+        """ pulls every reading since the last poll
+
+        Args:
+            perPage (int, optional): readings per page (3 - 1000). Defaults to 1000.
+
+        Returns:
+            SensorReadings: new readings
+        """
+        readings = SensorReadings()
+        for page in self.stream(perPage):
+            for row in page.rows():
+                readings.append(*row)
+        return readings
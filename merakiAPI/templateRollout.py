@@ -0,0 +1,76 @@
+from threading import Lock
+from typing import Callable
+from .merakiObject import _MerakiObject
+from .fanOut import fanOut, FanOutResult
+from .organizationObjects import _TemplateCatalog
+
+class _TemplateRollout(_MerakiObject):
+    def __init__(self, apiKey: str, organizationId: str, templateName: str = None, templateId: str = None) -> None:
+        """ init template rollout, the template is resolved once for every network
+
+        Args:
+            apiKey (str): api key of user
+            organizationId (str): organization id of template and networks
+            templateName (str, optional): name of template. Defaults to None.
+            templateId (str, optional): id of template, skips resolving the name. Defaults to None.
+        """
+        super().__init__(apiKey)
+        self.organizationId = organizationId
+        self.templateName = templateName
+        self.templateId = templateId if templateId != None else self.__getTemplateId(templateName)
+        self.progress = {} # network id to last step
+        self.__lock = Lock()
+
+    def __repr__(self) -> str:
+        return "Template Rollout template: %s, %i networks" % (self.templateName or self.templateId, len(self.progress))
+
+    def __getTemplateId(self, templateName: str) -> str:
+        return _TemplateCatalog.forOrganization(self._apiKey, self.organizationId).getId(templateName)
+
+    def __rolloutNetwork(self, network, autoBind: bool, unbind: bool, retainConfigs: bool, onProgress: Callable) -> str:
+        networkId = network if isinstance(network, str) else network.id
+
+        def step(status: str) -> None:
+            with self.__lock:
+                self.progress[networkId] = status
+                done = len([s for s in self.progress.values() if s in ['done', 'failed']])
+            if onProgress != None: onProgress(networkId, status, done, len(self.progress))
+
+        step('binding')
+        payload = {"configTemplateId": self.templateId, "autoBind": autoBind}
+        statusCode, response = self.apiCall('networks/%s/bind' % networkId, payload, 'POST')
+        if statusCode != 200:
+            step('failed')
+            raise RuntimeError('Did not Bind; error: %s %s' % (statusCode, response))
+
+        if unbind:
+            step('unbinding')
+            statusCode, response = self.apiCall('networks/%s/unbind' % networkId, {"retainConfigs": retainConfigs}, 'POST')
+            if statusCode != 200:
+                step('failed')
+                raise RuntimeError('Did not unbind; error: %s %s' % (statusCode, response))
+
+        if not isinstance(network, str): network.invalidateAppliance()
+        step('done')
+        return 'bound and unbound' if unbind else 'bound'
+
+    def run(self, networks: list, autoBind: bool = False, unbind: bool = True, retainConfigs: bool = True,
+            maxWorkers: int = 5, onProgress: Callable = None) -> FanOutResult:
+        """ binds (and unbinds) many networks at once
+
+        Args:
+            networks (list): network objects or network ids, network objects load their appliance again on next use
+            autoBind (bool, optional): autoBind setting of the bind. Defaults to False.
+            unbind (bool, optional): unbind right after binding, keeping the configs. Defaults to True.
+            retainConfigs (bool, optional): keep the template configs when unbinding. Defaults to True.
+            maxWorkers (int, optional): networks rolled out at once. Defaults to 5.
+            onProgress (Callable, optional): called with network id, step ('binding', 'unbinding', 'done', 'failed'), networks finished and networks started. Defaults to None.
+
+        Returns:
+            FanOutResult: result or error by network id
+        """
+        if self.templateId == None:
+            raise LookupError('template %s not found' % self.templateName)
+
+        return fanOut(networks, lambda network: self.__rolloutNetwork(network, autoBind, unbind, retainConfigs, onProgress),
+                      key=lambda network: network if isinstance(network, str) else network.id, maxWorkers=maxWorkers)
@@ -0,0 +1,373 @@
+import json
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from time import monotonic, sleep
+from typing import Callable, Union
+from urllib.parse import parse_qs, urlencode, urlsplit
+from requests import Session, exceptions
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import parse_header_links
+from .codec import encode
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+class _Response():
+    """ response of a transport that does not give a requests.Response, same attributes the package uses """
+    def __init__(self, statusCode: int, content: bytes = b'', headers: dict = None, url: str = None) -> None:
+        self.status_code = statusCode
+        self.content = content
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.url = url
+
+    def __repr__(self) -> str:
+        return "<Response [%i]>" % self.status_code
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+    @property
+    def links(self) -> dict:
+        """ Link header by rel, like requests.Response.links
+        """
+        links = {}
+        for link in parse_header_links(self.headers.get('Link', '')):
+            links[link.get('rel') or link.get('url')] = link
+        return links
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise exceptions.HTTPError('%i Error for url: %s' % (self.status_code, self.url), response=self)
+
+
+_apiUrl = 'https://api.meraki.com/api/v1/'
+
+class Transport():
+    """ sends the http requests of every meraki object, subclass and override send to use another client """
+    baseUrl = None
+    rateLimited = True # calls spend from the rate budget, False for transports never reaching meraki
+    
+    def _target(self, url: str) -> str:
+        """ url sent to, the meraki api url swapped for baseUrl when it is set
+        """
+        if self.baseUrl == None or not url.startswith(_apiUrl): return url
+        return self.baseUrl.rstrip('/') + '/' + url[len(_apiUrl):]
+
+    def send(self, method: str, url: str, headers: dict = None, params: dict = None, json: dict = None):
+        """ sends one request
+
+        Args:
+            method (str): http method
+            url (str): full url
+            headers (dict, optional): request headers. Defaults to None.
+            params (dict, optional): query parameters. Defaults to None.
+            json (dict, optional): json body. Defaults to None.
+
+        Raises:
+            requests.exceptions.ConnectionError, requests.exceptions.Timeout: if no response was received
+
+        Returns:
+            response with status_code, headers, links, json() and raise_for_status()
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class RequestsTransport(Transport):
+    def __init__(self, verify: Union[bool, str] = False, timeout: float = None, baseUrl: str = None,
+                 maxConnections: int = 32) -> None:
+        """ init requests transport, one session shared by every thread so connections are reused between calls,
+        settings are passed on each call and never changed on the session
+
+        Args:
+            verify (Union[bool, str], optional): verify tls certificates, or path of the ca bundle to verify with. Defaults to False.
+            timeout (float, optional): seconds to wait for meraki, if None waits forever. Defaults to None.
+            baseUrl (str, optional): url to send to instead of https://api.meraki.com/api/v1 ex: a local test server. Defaults to None.
+            maxConnections (int, optional): connections kept open per host, at least the threads sharing the transport
+                or the extra connections are closed after each call. Defaults to 32.
+        """
+        self.verify = verify
+        self.timeout = timeout
+        self.baseUrl = baseUrl
+        self.session = Session()
+        adapter = HTTPAdapter(pool_maxsize=maxConnections)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def __repr__(self) -> str:
+        return "Requests Transport verify: %s" % self.verify
+
+    def send(self, method: str, url: str, headers: dict = None, params: dict = None, json: dict = None):
+        # json encoded here so the fastest codec installed is used
+        return self.session.request(method, self._target(url), headers=headers, params=params,
+                                    data=encode(json) if json != None else None, verify=self.verify, timeout=self.timeout)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class HttpxTransport(Transport):
+    def __init__(self, verify: Union[bool, str] = False, timeout: float = None, http2: bool = False,
+                 baseUrl: str = None, maxConnections: int = None) -> None:
+        """ init httpx transport, needs httpx installed (and h2 for http2)
+
+        Args:
+            verify (Union[bool, str], optional): verify tls certificates, or path of the ca bundle to verify with. Defaults to False.
+            timeout (float, optional): seconds to wait for meraki, if None waits forever. Defaults to None.
+            http2 (bool, optional): use http/2 when the server offers it. Defaults to False.
+            baseUrl (str, optional): url to send to instead of https://api.meraki.com/api/v1 ex: a local test server. Defaults to None.
+            maxConnections (int, optional): max open connections, if None the httpx default. Defaults to None.
+        """
+        if httpx == None: raise ImportError('HttpxTransport needs httpx, pip install httpx')
+        self.http2 = http2
+        self.baseUrl = baseUrl
+        self.httpVersions = {} # http version to responses received with it, to check the server spoke http/2
+        self.__lock = Lock()
+        limits = httpx.Limits() if maxConnections == None else \
+                 httpx.Limits(max_connections=maxConnections, max_keepalive_connections=maxConnections)
+        try:
+            self.client = httpx.Client(verify=verify, timeout=timeout, http2=http2, limits=limits)
+        except ImportError:
+            raise ImportError('http2 needs h2, pip install httpx[http2]')
+
+    def __repr__(self) -> str:
+        return "Httpx Transport http2: %s" % self.http2
+
+    def send(self, method: str, url: str, headers: dict = None, params: dict = None, json: dict = None):
+        try:
+            response = self.client.request(method, self._target(url), headers=headers, params=params,
+                                           content=encode(json) if json != None else None)
+        except httpx.TimeoutException as err:
+            raise exceptions.Timeout(err)
+        except httpx.TransportError as err:
+            raise exceptions.ConnectionError(err)
+        
+        with self.__lock:
+            self.httpVersions[response.http_version] = self.httpVersions.get(response.http_version, 0) + 1
+        return _Response(response.status_code, response.content, dict(response.headers), str(response.url))
+
+    def close(self) -> None:
+        self.client.close()
+
+
+class Http2Transport(HttpxTransport):
+    def __init__(self, verify: Union[bool, str] = False, timeout: float = None, baseUrl: str = None,
+                 maxConnections: int = 2) -> None:
+        """ init http/2 transport, concurrent calls (fan outs) are multiplexed as streams over a few connections
+        instead of opening one connection each, needs httpx[http2]
+
+        Args:
+            verify (Union[bool, str], optional): verify tls certificates, or path of the ca bundle to verify with. Defaults to False.
+            timeout (float, optional): seconds to wait for meraki, if None waits forever. Defaults to None.
+            baseUrl (str, optional): url to send to instead of https://api.meraki.com/api/v1 ex: a local h2 server. Defaults to None.
+            maxConnections (int, optional): max open connections. Defaults to 2.
+        """
+        super().__init__(verify, timeout, True, baseUrl, maxConnections)
+
+    def __repr__(self) -> str:
+        return "Http2 Transport"
+
+
+class InMemoryTransport(Transport):
+    rateLimited = False
+
+    def __init__(self) -> None:
+        """ init in memory transport, answers from routes added with add instead of the network
+        """
+        self.routes = []
+        self.calls = [] # (method, url, params, json) of every request
+        self.__lock = Lock()
+
+    def __repr__(self) -> str:
+        return "In Memory Transport: %i routes, %i calls" % (len(self.routes), len(self.calls))
+
+    def add(self, method: str, pattern: str, body: Union[Callable, dict, list] = None,
+            statusCode: int = 200, headers: dict = None) -> None:
+        """ adds a route, the first matching route answers
+
+        Args:
+            method (str): http method
+            pattern (str): regex matched against the endpoint ex: 'organizations/(\\w+)/networks'
+            body (Union[Callable, dict, list], optional): json body, or a function taking (match, params, json)
+                returning a body or a full response, params also holds the query string of the url (next page links).
+                Defaults to None.
+            statusCode (int, optional): status code. Defaults to 200.
+            headers (dict, optional): response headers. Defaults to None.
+        """
+        self.routes.append((method, re.compile(pattern + '$'), body, statusCode, headers))
+
+    def send(self, method: str, url: str, headers: dict = None, params: dict = None, json: dict = None):
+        with self.__lock:
+            self.calls.append((method, url, params, json))
+
+        endpoint = url.split('/api/v1/', 1)[-1].split('?')[0]
+        query = {key: values[0] if len(values) == 1 else values for key, values in parse_qs(urlsplit(url).query).items()}
+        if len(query) > 0: params = query | (params or {})
+        for routeMethod, pattern, body, statusCode, routeHeaders in self.routes:
+            match = pattern.match(endpoint)
+            if routeMethod != method or match == None: continue
+            if callable(body): body = body(match, params, json)
+            if isinstance(body, _Response):
+                if body.url == None: body.url = url
+                return body
+            return _Response(statusCode, _dumps(body), routeHeaders, url)
+        return _Response(404, _dumps({'errors': ['No route for %s %s' % (method, endpoint)]}), None, url)
+
+
+def _dumps(body) -> bytes:
+    return b'' if body == None else json.dumps(body).encode()
+
+def _dumpLine(exchange: dict) -> str:
+    return json.dumps(exchange) + '\n'
+
+def _exchangeKey(method: str, url: str, params: dict, body: dict) -> str:
+    """ what a recorded response is looked up by on replay
+    """
+    query = urlencode(sorted((params or {}).items()), doseq=True)
+    return '%s %s?%s %s' % (method, url, query, json.dumps(body, sort_keys=True))
+
+# headers never written to a recording
+_redacted = ['x-cisco-meraki-api-key', 'authorization']
+
+
+class RecordingTransport(Transport):
+    def __init__(self, path: str, transport: Transport = None) -> None:
+        """ init recording transport, sends through transport and appends every exchange to a jsonl file
+        (api keys are not written)
+
+        Args:
+            path (str): file to append the exchanges to
+            transport (Transport, optional): transport actually sending, if None a RequestsTransport. Defaults to None.
+        """
+        self.path = path
+        self.transport = transport if transport != None else RequestsTransport()
+        self.start = monotonic()
+        self.__lock = Lock()
+
+    def __repr__(self) -> str:
+        return "Recording Transport to: %s" % self.path
+
+    @property
+    def rateLimited(self) -> bool:
+        return self.transport.rateLimited
+
+    def send(self, method: str, url: str, headers: dict = None, params: dict = None, json: dict = None):
+        sent = monotonic()
+        response = self.transport.send(method, url, headers=headers, params=params, json=json)
+        elapsed = monotonic() - sent
+
+        exchange = {
+            'at': sent - self.start,
+            'elapsed': elapsed,
+            'method': method,
+            'url': url,
+            'params': params,
+            'json': json,
+            'headers': {k: v for k, v in (headers or {}).items() if k.lower() not in _redacted},
+            'statusCode': response.status_code,
+            'responseHeaders': dict(response.headers),
+            'body': response.content.decode('utf-8', errors='replace'),
+        }
+        with self.__lock:
+            with open(self.path, 'a') as file:
+                file.write(_dumpLine(exchange))
+        return response
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class ReplayTransport(Transport):
+    rateLimited = False
+
+    def __init__(self, path: str, speed: float = None) -> None:
+        """ init replay transport, answers from a recording instead of the network, requests are matched by method,
+        url, query and body, the same request recorded twice is answered in recorded order
+
+        Args:
+            path (str): recording written by RecordingTransport
+            speed (float, optional): timing of the replay, 1 answers each call as long after the first call as it was
+                recorded (gaps between calls and the time they took), 10 ten times sooner, None does not wait. Defaults to None.
+        """
+        self.path = path
+        self.speed = speed
+        self.exchanges = {}
+        self.replayed = 0
+        self.first = None # recorded time of the first call
+        self.start = None # time the first call was replayed
+        self.__lock = Lock()
+
+        with open(path) as file:
+            for line in file:
+                if line.strip() == '': continue
+                exchange = json.loads(line)
+                key = _exchangeKey(exchange['method'], exchange['url'], exchange['params'], exchange['json'])
+                self.exchanges.setdefault(key, []).append(exchange)
+                self.first = exchange['at'] if self.first == None else min(self.first, exchange['at'])
+
+    def __repr__(self) -> str:
+        return "Replay Transport from: %s, %i replayed" % (self.path, self.replayed)
+
+    def send(self, method: str, url: str, headers: dict = None, params: dict = None, json: dict = None):
+        key = _exchangeKey(method, url, params, json)
+        with self.__lock:
+            recorded = self.exchanges.get(key, [])
+            if len(recorded) == 0:
+                raise exceptions.ConnectionError('No recorded response for %s %s' % (method, url))
+            # the last recording of a request keeps answering once the others are used
+            exchange = recorded.pop(0) if len(recorded) > 1 else recorded[0]
+            self.replayed += 1
+            if self.start == None: self.start = monotonic()
+
+        if self.speed != None:
+            answered = self.start + (exchange['at'] - self.first + exchange['elapsed']) / self.speed
+            # a request sent later than recorded still waits as long as the recorded call took
+            sleep(max(answered - monotonic(), exchange['elapsed'] / self.speed))
+        return _Response(exchange['statusCode'], exchange['body'].encode(), exchange['responseHeaders'], url)
+
+
+_defaultTransport = [None]
+_defaultTransportLock = Lock()
+_transport = ContextVar('transport', default=None)
+
+def getTransport() -> Transport:
+    """ transport of the current context, the default one (a RequestsTransport shared by every thread) if none is in use
+    """
+    transport = _transport.get()
+    if transport != None: return transport
+    if _defaultTransport[0] == None:
+        with _defaultTransportLock:
+            if _defaultTransport[0] == None: _defaultTransport[0] = RequestsTransport()
+    return _defaultTransport[0]
+
+def setTransport(transport: Transport) -> None:
+    """ sets the transport of every call
+
+    Args:
+        transport (Transport): transport ex: HttpxTransport(), ReplayTransport('session.jsonl')
+    """
+    _defaultTransport[0] = transport
+
+@contextmanager
+def useTransport(transport: Transport):
+    """ every call made inside the with block (and fan outs started from it) goes through transport
+
+    Args:
+        transport (Transport): transport to use
+    """
+    token = _transport.set(transport)
+    try:
+        yield transport
+    finally:
+        _transport.reset(token)